@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import write_csv  # noqa: E402
+from scanner import export  # noqa: E402
+from scanner.ingest import read_services  # noqa: E402
+from scanner.keywords import keyword_index  # noqa: E402
+from scanner.pipeline import filter_services, output_columns, sort_output  # noqa: E402
+from scanner.reconcile import reconcile  # noqa: E402
+from scanner import rules  # noqa: E402
+
+# Stage benchmarks on synthetic exports.
+#
+#     python benchmarks/run.py --sizes 1000,10000,100000
+#     python benchmarks/run.py --sizes 1000000 --repeat 1 --skip png
+#     python benchmarks/run.py --update-baseline
+#
+# Every stage is timed separately and written to benchmarks/results.json.
+# Timings are compared with the committed benchmarks/baseline.json; a stage
+# more than --tolerance times slower than baseline (and slower by at least
+# --min-delta seconds, to ignore timer noise) fails the run.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results.json')
+
+DEFAULT_SIZES = [1_000, 10_000]
+
+DEFAULT_REPEAT = 3
+repeat = DEFAULT_REPEAT
+
+def timed(timings, name, func, *args):
+    # Best of `repeat` runs; the minimum is the least noisy estimate.
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    timings[name] = round(best, 4)
+    return result
+
+def warm_up(skip):
+    # Pay the one-off matplotlib / xlsxwriter imports outside the timings.
+    if 'excel' not in skip:
+        import xlsxwriter  # noqa: F401
+    if 'png' not in skip:
+        import matplotlib.backends.backend_agg  # noqa: F401
+        import matplotlib.figure  # noqa: F401
+
+def bench_size(n, workdir, skip):
+    timings = {}
+    path = os.path.join(workdir, f'services_{n}.csv')
+    write_csv(path, n)
+
+    df = timed(timings, 'parse', read_services, path)
+    df_filtered = timed(timings, 'filter', filter_services, df)
+
+    hits = timed(timings, 'keyword_index', keyword_index, df_filtered)
+    timed(timings, 'check:Manager', rules.manager, df_filtered)
+    results = pd.DataFrame(index=df_filtered.index)
+    for col, rule in rules.column_rules:
+        results[col] = timed(timings, f'check:{col}', rule, df_filtered, hits)
+    results['Marked Ready'] = timed(
+        timings, 'check:Marked Ready', rules.marked_ready,
+        df_filtered, results['Items added to inventory?'], results['Note Followup Criteria']
+    )
+    failures = timed(timings, 'failure_mask', rules.failure_mask, results)
+    results['Action Items'] = timed(timings, 'action_items', rules.action_items, results, failures)
+    results['Score'] = timed(timings, 'score', rules.score, failures)
+
+    df_evaluated = timed(timings, 'evaluate', rules.evaluate, df_filtered)
+    timed(timings, 'reconcile', reconcile, df, df_filtered)
+    df_output = timed(timings, 'sort', sort_output, df_evaluated[output_columns])
+
+    if 'excel' not in skip:
+        timed(timings, 'excel', export.excel_report, df_output)
+    if 'png' not in skip:
+        timed(timings, 'png_page', export.table_image, export.top_rows(df_output))
+
+    os.remove(path)
+    return {'rows': n, 'visits': len(df_output), 'timings': timings}
+
+def compare(results, baseline, tolerance, min_delta):
+    # (regressions, stages the baseline has no timing for).
+    regressions, unmeasured = [], []
+    for size, current in results['sizes'].items():
+        base = baseline.get('sizes', {}).get(size)
+        if base is None:
+            continue
+        for stage, seconds in current['timings'].items():
+            before = base['timings'].get(stage)
+            if before is None:
+                unmeasured.append(f'{size} rows, {stage}')
+                continue
+            if seconds > before * tolerance and seconds - before > min_delta:
+                regressions.append(f'{size} rows, {stage}: {seconds:.3f}s vs baseline {before:.3f}s')
+    return regressions, unmeasured
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the analyzer stages on synthetic exports.')
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help='comma-separated visit counts (e.g. 1000,100000,1000000)')
+    parser.add_argument('--skip', default='', help='comma-separated stages to skip: excel, png')
+    parser.add_argument('--output', default=RESULTS_PATH, help='where to write the JSON results')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=1.5, help='allowed slowdown factor per stage')
+    parser.add_argument('--min-delta', type=float, default=0.05, help='ignore slowdowns smaller than this (seconds)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='runs per stage; the fastest is kept')
+    parser.add_argument('--update-baseline', action='store_true', help='write the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    global repeat
+    repeat = max(args.repeat, 1)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    skip = {s.strip() for s in args.skip.split(',') if s.strip()}
+    results = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'sizes': {},
+    }
+    warm_up(skip)
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            results['sizes'][str(n)] = bench_size(n, workdir, skip)
+            total = sum(results['sizes'][str(n)]['timings'].values())
+            print(f'{n} rows: {total:.2f}s across {len(results["sizes"][str(n)]["timings"])} stages')
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {args.output}')
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Baseline updated: {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline to compare against; run with --update-baseline.')
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions, unmeasured = compare(results, baseline, args.tolerance, args.min_delta)
+    for line in unmeasured:
+        print(f'NOT IN BASELINE: {line}; run with --update-baseline', file=sys.stderr)
+    for line in regressions:
+        print(f'REGRESSION: {line}', file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Synthetic services.csv generator. Output has every column of the real
+# export header (services.csv at the repo root). The columns the analyzer
+# reads get plausible values; the rest stay empty, as they mostly are in
+# real exports.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEADER_PATH = os.path.join(ROOT, 'services.csv')
+
+service_types = {
+    'Opening Package - 4 Visits': 14, 'Opening Visit Package 2 of 4': 8, 'Opening Visit Package 3 of 4': 8,
+    'Opening Visit Package 4 of 4': 6, 'Opening 1 Visit Only': 6, 'Cleaning - Bi-Weekly - Chlorine Pools': 10,
+    'Cleaning - Bi-weekly - Salt Pools': 8, 'Cleaning - Weekly - Chlorine Pools': 10, 'Service Call': 6,
+    'Hourly Labor': 5, 'Liner -  Quote': 2, 'Liner - Chemical Adjustment': 2, 'Opening - Follow-Up Visit': 3,
+    'Labor - Followup Visit': 2, 'Admin-Water Testing': 1,
+    # Excluded from analysis
+    'Note': 10, 'Admin-Load Sheets': 3, 'Admin-End of Day Checklist': 3, 'Admin-Office Task': 1,
+    'Admin-Warehouse Work - Technicians': 1,
+}
+
+techs = [
+    ('Nate', 'D'), ('David', 'M'), ('Luke', 'C'), ('Quentin', 'H'), ('Noah', 'L'), ('Garrett', 'R'),
+    ('Alex', 'E'), ('Avery', 'J'), ('DJ', 'K'), ('Sandy', 'Komisarek'), ('Marcus', 'R'), ('Whitney', 'R'),
+]
+
+items_used = [
+    '12 (Chem: Granular Shock (lb)) 12 (Chem: Alkalinity (lbs)) 12 (Chem: Calcium Increaser (lbs)) ',
+    '7 (Chem: Calcium Increaser (lbs)) ',
+    '8 (Chem: Granular Shock (lb)) 3 (Chem: Stabilizer (lbs)) 7 (Chem: Alkalinity (lbs)) ',
+    '5 (Chem: Granular Shock (lb)) 2 (Chem: Muriatic Acid (QT)) ',
+    '1 (Chem: Phosfree (qt)) 2 (Chem: Liquid Chlorine (gal)) ',
+    '2 (Chem: Liquid Chlorine (gal)) ',
+    '1 (Pentair: Sta-Rite Pressure Release Valve) ',
+    '1 (Service: Opening Heater Cleanout) 1 (Install: Skimmer Basket) ',
+    '2 (Ladder Bumper) 2 (Ladder Ring) ',
+    '1 (Pool Perfect + Phosfree (qt)) 3 (Chem: Stabilizer (lbs)) ',
+]
+
+notes = [
+    'Today we completed the next visit of your opening package. We vacuumed, brushed, and adjusted chemicals as needed. Thank you, have a great day!',
+    'Today we opened the pool and installed the intake valves and skimmer basket. We also tested chemicals and added them accordingly.',
+    'We discovered a small leak in the plumbing, and will schedule someone to repair it. Thank you!',
+    'Unable to leave the system running due to a leak in the heater. Please leave the return fittings out, we will install them next visit.',
+    'The pool has been opened and chemicals were added. We will be out soon to continue clearing the pool.',
+    'Pool closed for the season. See you next year!',
+    'Customer asked for a quote on a new liner, need to come back to measure.',
+    'Vacuumed, brushed, skimmed. Water is clear & balanced #3 filter cleaned.',
+    'chlorne low, added shok. wil folow up',
+    'Salt cell flashing flow error; cleaned cell, good salt. Have a good week.',
+]
+
+condition_values = ['Crystal Clear', "Can't See Floor", 'Dull and or Cloudy', 'Barely See Floor']
+color_values = ['Blue', 'Green', 'Green Hue']
+
+def read_header():
+    return list(pd.read_csv(HEADER_PATH, nrows=0).columns)
+
+def _pick(rng, values, n, weights=None):
+    p = None if weights is None else np.asarray(weights, dtype=float) / sum(weights)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=p)]
+
+def _maybe(rng, values, missing):
+    return np.where(rng.random(len(values)) < missing, np.nan, values)
+
+def generate(n, seed=0, start_row=0, days=None):
+    rng = np.random.default_rng([seed, start_row])
+    days = days or max(1, (start_row + n) // 60)
+
+    tech = rng.integers(len(techs), size=n)
+    start = (
+        pd.Timestamp('2025-05-01')
+        + pd.to_timedelta(rng.integers(days, size=n), unit='D')
+        + pd.to_timedelta(rng.integers(7 * 60, 17 * 60, size=n), unit='min')
+    )
+    duration = np.clip(rng.lognormal(3.3, 0.8, size=n).astype(int), 1, 480)
+    tested = rng.random(n) >= 0.45
+
+    df = pd.DataFrame({
+        'Customer Name': [f'Customer {i}' for i in rng.integers(max(1, (start_row + n) // 5), size=n)],
+        'Service Type': _pick(rng, list(service_types), n, list(service_types.values())),
+        'Duration': duration,
+        'Start Time': start.strftime('%m/%d/%Y %I:%M %p').str.lower(),
+        'End Time': (start + pd.to_timedelta(duration, unit='min')).strftime('%m/%d/%Y %I:%M %p').str.lower(),
+        'Service Status': _pick(rng, ['Complete', 'Follow Up with Customer', 'Need to Return'], n, [96, 2, 2]),
+        'Private Notes': _maybe(rng, _pick(rng, notes, n), 0.5),
+        'Customer Notes': _maybe(rng, _pick(rng, notes, n), 0.1),
+        'Tech 1 First Name': np.array([t[0] for t in techs], dtype=object)[tech],
+        'Tech 1 Last Name': np.array([t[1] for t in techs], dtype=object)[tech],
+        'Water Condition Reading': np.where(tested, _pick(rng, condition_values, n, [60, 20, 15, 5]), np.nan),
+        'Water Color Reading': np.where(tested, _pick(rng, color_values, n, [75, 22, 3]), np.nan),
+        'Free Chlorine Reading': np.where(tested, _pick(rng, [0, 0, 0, 1, 2, 3, 4, 5, 6, 8, 10], n), np.nan),
+        'Phosphorus Reading': np.where(tested, _pick(rng, [0, 0, 0, 0, 300, 600, 1000, 1500], n), np.nan),
+        'Cyanuric Acid Reading': np.where(tested, _pick(rng, [0, 20, 30, 40, 50, 70, 90, 150], n), np.nan),
+        'Filter Pressure': np.where(tested, np.clip(rng.normal(17, 5, size=n).round(), 0, 30), np.nan),
+        'Items Used': np.where(tested, _pick(rng, items_used, n), np.nan),
+        'Billing Status': _pick(rng, ['Not Billed', 'Unbillable', 'Ready'], n, [60, 33, 7]),
+        'Water Samples': np.where(rng.random(n) < 0.03, np.array('Yes', dtype=object), np.nan),
+    }, index=pd.RangeIndex(start_row, start_row + n))
+
+    # Truck sheets: mileage, shock loaded in the morning and unloaded at night.
+    load = df['Service Type'].eq('Admin-Load Sheets').to_numpy()
+    unload = df['Service Type'].eq('Admin-End of Day Checklist').to_numpy()
+    odometer = rng.integers(20_000, 200_000, size=n)
+    df['Beginning Mileage'] = np.where(load, odometer, np.nan)
+    df['Ending Mileage'] = np.where(unload, odometer + rng.integers(20, 150, size=n), np.nan)
+    df['Shock Loaded'] = np.where(load, rng.integers(20, 60, size=n), np.nan)
+    df['Shock Unloaded'] = np.where(unload, rng.integers(0, 20, size=n), np.nan)
+    return df
+
+def write_csv(path, n, seed=0, chunk_rows=50_000):
+    # Written in chunks so a 1M-visit file never holds all ~660 columns in
+    # memory at once.
+    header = read_header()
+    days = max(1, n // 60)
+    for start in range(0, n, chunk_rows):
+        chunk = generate(min(chunk_rows, n - start), seed, start, days).reindex(columns=header)
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    if n == 0:
+        pd.DataFrame(columns=header).to_csv(path, index=False)
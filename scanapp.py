@@ -1,280 +1,283 @@
-import streamlit as st
-import pandas as pd
 from datetime import datetime
-import io
-import re
+import hashlib
 import os
-os.system('pip install xlsxwriter matplotlib seaborn')
-
-import xlsxwriter
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# ---------- CHECK FUNCTIONS ----------
-
-def check_range(val, low, high):
-    if pd.isna(val): return 'NA'
-    if val < low: return 'Low Chlorine'
-    if val > high: return 'High Chlorine'
-    return 'Pass'
-
-def check_chlorine_range(row):
-    return check_range(row.get('Free Chlorine Reading'), 3, 8)
-
-def check_cya_range(row):
-    val = row.get('Cyanuric Acid Reading')
-    items = str(row.get('Items Used', '')).lower()
-    if pd.isna(val): return 'NA'
-    if val < 40:
-        return 'Low and Adjusted' if 'stabilizer' in items else 'Fail'
-    elif val > 80:
-        return 'High CYA'
-    else:
-        return 'Pass'
-
-def check_phosphate_range(row):
-    val = row.get('Phosphorus Reading')
-    items = str(row.get('Items Used', '')).lower()
-    if pd.isna(val): return 'NA'
-    if any(k in items for k in ['phosphate', 'phosfree', 'pool perfect']):
-        return 'Pass'
-    return 'Fail' if val >= 600 else 'Pass'
-
-def check_color_condition(row):
-    cond = row.get('Water Condition Reading')
-    color = row.get('Water Color Reading')
-    if pd.isna(cond) or pd.isna(color): return 'NA'
-    issues = []
-    if cond != 'Crystal Clear': issues.append(cond)
-    if color != 'Blue': issues.append(color)
-    return f"Fail - {', '.join(issues)}" if issues else 'Pass'
-
-def check_filter_pressure(row):
-    val = row.get('Filter Pressure')
-    if pd.isna(val): return 'NA'
-    if val == 0: return 'Fail'
-    if val < 5: return 'Low Pressure'
-    if val > 22: return 'High Pressure'
-    return 'Pass'
-
-def check_system_primed(row):
-    value = str(row.get('System Primed and Running', '')).strip().lower()
-    return 'Fail' if value == 'no' else 'Pass'
-
-def check_followup(row):
-    status = row.get('Service Status')
-    return 'Pass' if status == 'Complete' else 'Fail' if pd.notna(status) else 'NA'
-
-def check_items_inventory(row):
-    notes = f"{row.get('Private Notes', '')}{row.get('Customer Notes', '')}".lower()
-    used = str(row.get('Items Used', '')).lower()
-    keywords = ['install', 'leave', 'using', 'sell', 'complete']
-    if 'chem' in used:
-        return 'Pass'
-    if any(k in notes for k in keywords) and not any(k in used for k in keywords):
-        return 'Fail'
-    return 'Pass' if notes.strip() else 'NA'
-
-def check_note_followup(row):
-    notes = f"{row.get('Private Notes', '')} {row.get('Customer Notes', '')}".lower()
-    followup_keywords = ['follow up', 'schedule', 'quote', 'return', 'next visit', 'need to come back']
-    exclusion_phrases = ['have a good', 'see you next year', 'closed for the season']
-    if any(phrase in notes for phrase in exclusion_phrases):
-        return 'Pass'
-    return 'Fail' if any(k in notes for k in followup_keywords) else 'Pass' if notes.strip() else 'NA'
-
-def check_add_notes_next_visit(row):
-    value = row.get('Add Notes for Next Visit', False)
-    if value is True or str(value).strip().lower() == 'true' or value == 1:
-        return 'Fail'
-    return ''
-
-def check_quote_needed(row):
-    value = row.get('Quote needed?', False)
-    if value is True or str(value).strip().lower() == 'true' or value == 1:
-        return 'Fail'
-    return ''
-
-def check_chlorine_added(row):
-    val = row.get('Free Chlorine Reading')
-    items = str(row.get('Items Used', '')).lower()
-    if pd.isna(val): return 'NA'
-    if val < 3:
-        return 'Pass' if 'shock' in items else 'Fail'
-    return 'Pass'
-
-def assign_manager(row):
-    tech = str(row.get('Tech 1 First Name', '')).strip()
-    quentin_team = {'Nate', 'David', 'Luke', 'Quentin'}
-    alex_team = {'Noah', 'Garrett', 'Alex', 'Avery'}
-    if tech in quentin_team: return 'Quentin'
-    elif tech in alex_team: return 'Alex'
-    return 'Z - Other'
-
-def check_water_sample(row):
-    return 'Sample to Test' if pd.notna(row.get('Water Samples')) and str(row.get('Water Samples')).strip() != '' else ''
-
-def spelling_rank(row):
-    note = str(row.get('Customer Notes', '')).strip()
-    if not note:
-        return 3
-    words = note.split()
-    issues = sum(1 for word in words if re.search(r'[^a-zA-Z0-9.,?!\'\"()\-\s]', word))
-    if issues > 4 or len(words) < 3:
-        return 1
-    elif issues > 1:
-        return 2
-    return 3
-
-criteria_columns = [
-    'Chlorine Range', 'CYA Range', 'Phosphate Range Untreated', 'Color And Condition',
-    'Filter Pressure', 'System Primed', 'Followup', 'Items added to inventory?',
-    'Note Followup Criteria', 'Chlorine Added'
-]
-
-def compute_action_items(row):
-    items = [f"{col}: {row[col]}" for col in criteria_columns if row[col] == 'Fail']
-    if row.get('Water Sample') == 'Sample to Test':
-        items.append('Water Sample: Sample to Test')
-    return ', '.join(items)
-
-def calculate_score(row):
-    return sum(row[col] == 'Fail' for col in criteria_columns)
-
-def determine_marked_ready(row):
-    billing = str(row.get('Billing Status', '')).strip().lower()
-    inventory = row.get('Items added to inventory?')
-    followup = row.get('Note Followup Criteria')
-    if billing == 'not billed': return ''
-    if billing == 'ready' and (inventory == 'Fail' or followup == 'Fail'):
-        return 'Yes'
-    if billing == 'ready': return 'Ready'
-    return ''
+
+from scanner import profiling, startup
+
+with startup.timed('import streamlit'):
+    import streamlit as st
+with startup.timed('import pandas'):
+    import pandas as pd
+with startup.timed('import scanner'):
+    from scanner import export
+    from scanner.browse import ResultIndex
+    from scanner.ingest import MissingColumnsError, read_original, read_services
+    from scanner.pipeline import (
+        analyze, analyze_stream, open_store, read_exports, read_original_exports, source_column
+    )
+    from scanner.rollups import RollupStore
+    from scanner.roster import RosterError
+    from scanner.rules import results_version
+
+# matplotlib and xlsxwriter are imported on first export, not at startup.
+
+# ---------- CACHED PIPELINE ----------
+
+# Streamlit reruns this script on every interaction. Each stage below is
+# cached on the SHA-256 of the uploaded bytes plus the rule and roster
+# version, so an unchanged upload never re-parses, re-analyzes or
+# re-renders. Arguments with a leading underscore are excluded from the
+# cache key.
+
+CACHE_ENTRIES = 4
+
+# Per-visit results and trend rollups persist here between uploads.
+STORE_PATH = os.environ.get('SCANAPP_STORE', 'scan_results.sqlite')
+
+# An upload is one export's bytes, or a tuple of (file name, bytes) when
+# several branch exports are uploaded together; those are parsed
+# concurrently and combined into one dataset with a Source File column.
+
+def parse_upload(data):
+    return read_services(data) if isinstance(data, bytes) else read_exports(list(data))
+
+def parse_original(data):
+    return read_original(data) if isinstance(data, bytes) else read_original_exports(list(data))
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def load_upload(digest, _data):
+    return parse_upload(_data)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def load_original(digest, _data):
+    return parse_original(_data)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner="Analyzing service report...")
+def analyze_upload(digest, version, _data, chunksize=None, incremental=False, record_trends=False):
+    # chunksize switches to streaming mode: the upload is parsed and checked
+    # in bounded chunks instead of as one frame. incremental reuses stored
+    # results for visits already seen in earlier uploads. Results are
+    # identical either way. record_trends folds the visits into the
+    # weekly rollups.
+    store = open_store(STORE_PATH) if incremental else None
+    rollups = RollupStore(STORE_PATH) if record_trends else None
+    try:
+        if chunksize:
+            return analyze_stream(_data, chunksize, store, rollups)
+        return analyze(load_upload(digest, _data), store, rollups)
+    finally:
+        for db in (store, rollups):
+            if db is not None:
+                db.close()
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def result_index(digest, version, _analysis):
+    # Built once per report and shared rather than copied on every rerun
+    # like cache_data results; only ever read.
+    return ResultIndex(_analysis.output, _analysis.tech)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def weekly_trends(by, weeks):
+    rollups = RollupStore(STORE_PATH)
+    try:
+        return rollups.trends(by, weeks)
+    finally:
+        rollups.close()
+
+# The exports take the page's analysis rather than calling analyze_upload
+# again: its output is the same whichever mode produced it, so they are
+# keyed on the upload and results version alone.
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def excel_report(digest, version, _data, _analysis, include_original=True):
+    # Combined uploads get one extra sheet per branch export.
+    original = load_original(digest, _data) if include_original else None
+    return export.excel_report(_analysis.output, original, split_by=source_column, reconciliation=_analysis.reconciliation)
+
+image_modes = {
+    'Top rows by Score': None,
+    'Pages of the full report': None,
+    'One set of pages per Manager': 'Manager',
+}
+
+def image_pages(analysis, mode, rows):
+    df_output = analysis.output
+    if mode == 'Top rows by Score':
+        return [('top rows by Score', export.top_rows(df_output, rows))]
+    return export.paginate(df_output, rows, image_modes[mode])
+
+@st.cache_data(max_entries=CACHE_ENTRIES * 8, show_spinner=False)
+def table_image(digest, version, _analysis, mode, rows, page):
+    return export.table_image(image_pages(_analysis, mode, rows)[page][1])
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def table_images_zip(digest, version, _analysis, mode, rows):
+    df_output = _analysis.output
+    if mode == 'Top rows by Score':
+        df_output = export.top_rows(df_output, rows)
+    return export.table_images_zip(df_output, rows, image_modes[mode])
+
+# ---------- DIAGNOSTICS ----------
+
+# Stages only record timings inside profiling.collect(). Cached stages do
+# not run again on a cache hit, so the panel also offers an uncached run of
+# the whole pipeline (without touching the result store or rollups).
+
+def profile_pipeline(data, chunksize, include_original):
+    with profiling.collect() as records:
+        if chunksize:
+            analysis = analyze_stream(data, chunksize)
+        else:
+            analysis = analyze(parse_upload(data))
+        export.excel_report(
+            analysis.output, parse_original(data) if include_original else None,
+            split_by=source_column, reconciliation=analysis.reconciliation,
+        )
+        export.table_image(export.top_rows(analysis.output))
+    return records
+
+def diagnostics_panel(digest, data, chunksize, include_original):
+    with st.expander("🩺 Diagnostics", expanded=True):
+        if st.button("Profile the full pipeline", help="Parse, check and export this upload again without the cache"):
+            st.session_state['diagnostics'] = (digest, profile_pipeline(data, chunksize, include_original))
+        measured_digest, records = st.session_state.get('diagnostics', (None, []))
+        if measured_digest != digest or not records:
+            st.caption("Nothing measured for this upload yet: its results came from the cache.")
+            return
+        stages = pd.DataFrame(profiling.summarize(records))
+        stages['stage'] = ['\u2003' * depth + name for depth, name in zip(stages.pop('depth'), stages['stage'])]
+        st.dataframe(stages, use_container_width=True, hide_index=True, column_config={
+            'seconds': st.column_config.NumberColumn("Wall time (s)", format="%.3f"),
+            'peak_mb': st.column_config.NumberColumn("Peak memory (MB)", format="%.1f"),
+        })
+
+# ---------- RESULTS BROWSER ----------
+
+# Filters run on the cached ResultIndex and only the visible page is sent
+# to the browser.
+
+def results_browser(index):
+    manager_col, tech_col, ready_col = st.columns(3)
+    values = {
+        'Manager': manager_col.multiselect("Manager", index.options('Manager')),
+        'Tech': tech_col.multiselect("Tech", index.options('Tech')),
+        'Marked Ready': ready_col.multiselect("Marked Ready", index.options('Marked Ready'), format_func=lambda v: v or '(blank)'),
+    }
+    score_col, fail_col = st.columns([1, 2])
+    min_score = score_col.slider("Minimum Score", min_value=0, max_value=max(index.max_score(), 1), value=0)
+    failing = fail_col.multiselect("Failed any of", index.failure_columns)
+    positions = index.select(values, min_score, failing)
+
+    size_col, page_col = st.columns(2)
+    rows = size_col.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+    pages = max(-(-len(positions) // rows), 1)
+    page = page_col.number_input("Page", min_value=1, max_value=pages, value=1) - 1
+    st.caption(f"{len(positions)} of {index.size} visits match, page {page + 1} of {pages}.")
+    st.dataframe(index.page(positions, page, rows), use_container_width=True)
 
 # ---------- STREAMLIT APP ----------
 
-st.set_page_config(layout="wide")
-st.title("Pool Service Report Analyzer")
-
-uploaded_file = st.file_uploader("Upload your service CSV file", type=["csv"])
-
-if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-
-    excluded = [
-        'note', 'admin-end of day checklist', 'admin-load sheets',
-        'admin-office task', 'admin-warehouse work - technicians'
-    ]
-    df_filtered = df[~df['Service Type'].str.strip().str.lower().isin(excluded)].copy()
-
-    df_filtered['Manager'] = df_filtered.apply(assign_manager, axis=1)
-    df_filtered['Manager - Tech - Duration'] = df_filtered['Manager'] + ' - ' + df_filtered['Tech 1 First Name'] + ' - ' + df_filtered['Duration'].astype(str)
-
-    df_filtered['Chlorine Range'] = df_filtered.apply(check_chlorine_range, axis=1)
-    df_filtered['CYA Range'] = df_filtered.apply(check_cya_range, axis=1)
-    df_filtered['Phosphate Range Untreated'] = df_filtered.apply(check_phosphate_range, axis=1)
-    df_filtered['Color And Condition'] = df_filtered.apply(check_color_condition, axis=1)
-    df_filtered['Filter Pressure'] = df_filtered.apply(check_filter_pressure, axis=1)
-    df_filtered['System Primed'] = df_filtered.apply(check_system_primed, axis=1)
-    df_filtered['Followup'] = df_filtered.apply(check_followup, axis=1)
-    df_filtered['Items added to inventory?'] = df_filtered.apply(check_items_inventory, axis=1)
-    df_filtered['Note Followup Criteria'] = df_filtered.apply(check_note_followup, axis=1)
-    df_filtered['Add Notes for Next Visit'] = df_filtered.apply(check_add_notes_next_visit, axis=1)
-    df_filtered['Quote needed?'] = df_filtered.apply(check_quote_needed, axis=1)
-    df_filtered['Chlorine Added'] = df_filtered.apply(check_chlorine_added, axis=1)
-    df_filtered['Water Sample'] = df_filtered.apply(check_water_sample, axis=1)
-    df_filtered['Spelling Rank (1-3)'] = df_filtered.apply(spelling_rank, axis=1)
-    df_filtered['Marked Ready'] = df_filtered.apply(determine_marked_ready, axis=1)
-    df_filtered['Action Items'] = df_filtered.apply(compute_action_items, axis=1)
-    df_filtered['Score'] = df_filtered.apply(calculate_score, axis=1)
-
-    output_columns = [
-        'Customer Name', 'Service Type', 'Manager - Tech - Duration', 'Score', 'Marked Ready',
-        'Action Items', 'Add Notes for Next Visit', 'Quote needed?', 'Spelling Rank (1-3)', 'Water Sample',
-        'Chlorine Range', 'Chlorine Added', 'CYA Range', 'Phosphate Range Untreated',
-        'Color And Condition', 'Filter Pressure', 'System Primed', 'Followup',
-        'Items added to inventory?', 'Note Followup Criteria', 'Manager'
-    ]
-
-    df_output = df_filtered[output_columns].sort_values(by=['Manager', 'Score'], ascending=[True, False])
-
-    st.success("\u2705 Analysis complete.")
-    st.dataframe(df_output, use_container_width=True)
-
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df_output.to_excel(writer, sheet_name='Analysis Results', index=False)
-        df.to_excel(writer, sheet_name='Original Data', index=False)
-
-        workbook = writer.book
-        worksheet = writer.sheets['Analysis Results']
-        wrap_format = workbook.add_format({'text_wrap': True})
-        center_format = workbook.add_format({'align': 'center', 'valign': 'vcenter'})
-        red_format = workbook.add_format({'bg_color': '#FFC7CE', 'align': 'center', 'valign': 'vcenter', 'text_wrap': True})
-
-        worksheet.set_column('A:F', 20, wrap_format)
-        for col_idx in range(2, len(df_output.columns)):
-            width = 45 if df_output.columns[col_idx] in ['Action Items', 'Manager - Tech - Duration'] else 12
-            worksheet.set_column(col_idx, col_idx, width, center_format)
-
-        highlight_columns = [
-            'Items added to inventory?', 'Note Followup Criteria', 'Chlorine Added',
-            'CYA Range', 'Phosphate Range Untreated', 'Marked Ready', 'Filter Pressure',
-            'System Primed', 'Water Sample', 'Add Notes for Next Visit', 'Quote needed?'
-        ]
-
-        for col in highlight_columns:
-            if col in df_output.columns:
-                idx = df_output.columns.get_loc(col)
-                for i, val in enumerate(df_output[col], start=1):
-                    if isinstance(val, str) and val.strip() in ['Fail', 'Yes', 'Low Pressure', 'High Pressure', 'Sample to Test']:
-                        worksheet.write(i, idx, val, red_format)
-
-    output.seek(0)
+with startup.timed('render upload screen'):
+    st.set_page_config(layout="wide")
+    st.title("Pool Service Report Analyzer")
+
+    uploaded_files = st.file_uploader("Upload your service CSV file(s)", type=["csv"], accept_multiple_files=True)
+
+    streaming = st.sidebar.checkbox("Low-memory streaming mode", help="Analyze large multi-month exports in chunks")
+    chunksize = st.sidebar.number_input("Rows per chunk", min_value=1_000, value=50_000, step=10_000) if streaming else None
+    incremental = st.sidebar.checkbox("Reuse results from earlier uploads", help="Only new or changed visits are re-checked")
+    record_trends = st.sidebar.checkbox("Record weekly trends", help="Add this upload's visits to the per-day Manager/Tech rollups")
+    include_original = st.sidebar.checkbox("Include Original Data sheet in Excel report", value=True)
+    diagnostics = st.sidebar.checkbox("Diagnostics", help="Record wall time, rows and peak memory for each pipeline stage")
+
+startup.log_report()
+
+if st.sidebar.checkbox("Show weekly trends"):
+    st.subheader("📈 Weekly trends")
+    by_col, weeks_col = st.columns(2)
+    by = by_col.radio("Group by", ['Manager', 'Tech'], horizontal=True)
+    weeks = weeks_col.slider("Weeks", min_value=1, max_value=52, value=12)
+    trends = weekly_trends(by, weeks)
+    if trends.empty:
+        st.info("No trend data yet. Turn on 'Record weekly trends' and upload an export.")
+    else:
+        st.line_chart(trends.pivot(index='Week', columns=by, values='Average Score'))
+        st.dataframe(trends, use_container_width=True, hide_index=True)
+
+if uploaded_files:
+    if len(uploaded_files) == 1:
+        data = uploaded_files[0].getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+    else:
+        # Sorted by name so the same set of files always combines (and
+        # deduplicates) the same way.
+        data = tuple(sorted((f.name, f.getvalue()) for f in uploaded_files))
+        digest = hashlib.sha256(b''.join(
+            name.encode() + b'\0' + hashlib.sha256(content).digest() for name, content in data
+        )).hexdigest()
+
+    try:
+        version = results_version()
+        with profiling.collect(diagnostics) as records:
+            analysis = analyze_upload(digest, version, data, chunksize, incremental, record_trends)
+    except MissingColumnsError as e:
+        st.error(f"❌ {e}. Please upload a full service export.")
+        st.stop()
+    except RosterError as e:
+        st.error(f"❌ {e}. Please fix the technician roster file.")
+        st.stop()
+    if records:
+        st.session_state['diagnostics'] = (digest, records)
+
+    st.success("✅ Analysis complete.")
+    if not isinstance(data, bytes):
+        st.caption(f"{len(data)} exports combined; visits that appear in more than one are counted once.")
+    if incremental:
+        st.caption(f"{analysis.stats['evaluated']} new or changed visits checked, {analysis.stats['reused']} reused from earlier uploads.")
+    results_browser(result_index(digest, version, analysis))
+
+    for name, summary in analysis.summaries.items():
+        with st.expander(f"Summary by {name}"):
+            st.dataframe(summary, use_container_width=True)
+
+    with st.expander("🚚 Truck reconciliation"):
+        st.caption("Chemicals loaded minus unloaded on each tech's truck sheets vs. Items Used on that day's visits, and the day's mileage.")
+        st.dataframe(analysis.reconciliation, use_container_width=True, hide_index=True)
+
+    if diagnostics:
+        diagnostics_panel(digest, data, chunksize, include_original)
+
+    # Exports are built on click and cached, so reruns never rebuild them
     st.download_button(
         label="📥 Download Excel Report",
-        data=output.getvalue(),
+        data=lambda: excel_report(digest, version, data, analysis, include_original),
         file_name=f"Service_Report_Analysis_{datetime.now().strftime('%Y-%m-%d_%H-%M')}.xlsx",
         mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
 
-    # Generate image of the top 25 rows of the output table
-    df_display = df_output.copy()
-    plt.figure(figsize=(20, len(df_display) * 0.5))
-    ax = plt.gca()
-    ax.axis('off')
-
-    # Create table
-    table = plt.table(cellText=df_display.values,
-                      colLabels=df_display.columns,
-                      cellLoc='center',
-                      loc='center')
-
-    table.auto_set_font_size(False)
-    table.set_fontsize(8)
-    table.scale(1.2, 1.2)
-
-    # Highlight "Fail" and other key values
-    for (row, col), cell in table.get_celld().items():
-        if row == 0:
-            cell.set_fontsize(9)
-            cell.set_text_props(weight='bold')
-            cell.set_facecolor('#CCCCCC')
-        else:
-            val = df_display.iloc[row - 1, col]
-            if isinstance(val, str) and val.strip() in ['Fail', 'Yes', 'Low Pressure', 'High Pressure', 'Sample to Test']:
-                cell.set_facecolor('#FFC7CE')
-
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', bbox_inches='tight')
-    plt.close()
-    img_buffer.seek(0)
+    # Table images are rendered one fixed-size page at a time
+    st.subheader("Table images")
+    mode_col, rows_col, page_col = st.columns(3)
+    mode = mode_col.selectbox("Pages", list(image_modes))
+    rows = rows_col.number_input("Rows per page", min_value=5, max_value=100, value=export.PAGE_ROWS, step=5)
+    pages = image_pages(analysis, mode, rows)
+    if not pages:
+        st.info("No visits to render.")
+        st.stop()
+    page = page_col.selectbox("Page", range(len(pages)), format_func=lambda i: pages[i][0])
 
-    st.image(img_buffer, caption="Preview of Analysis Table", use_column_width=True)
     st.download_button(
         label="📸 Download Table Image",
-        data=img_buffer,
-        file_name="service_report_table.png",
+        data=lambda: table_image(digest, version, analysis, mode, rows, page),
+        file_name=f"service_report_table_{page + 1}.png",
         mime="image/png"
     )
+    st.download_button(
+        label="🗂️ Download All Pages (zip)",
+        data=lambda: table_images_zip(digest, version, analysis, mode, rows),
+        file_name="service_report_tables.zip",
+        mime="application/zip"
+    )
+
+    if st.checkbox("Show table image preview"):
+        st.image(table_image(digest, version, analysis, mode, rows, page), caption=f"Preview of Analysis Table ({pages[page][0]})", use_column_width=True)
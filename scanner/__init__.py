@@ -0,0 +1,19 @@
+import importlib
+
+# Public API, resolved on first access so `from scanner import startup` can
+# run before pandas is imported (see scanner.startup).
+_exports = {
+    'Analysis': 'pipeline',
+    'analyze': 'pipeline',
+    'analyze_stream': 'pipeline',
+    'read_exports': 'pipeline',
+    'MissingColumnsError': 'ingest',
+    'read_services': 'ingest',
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f'.{_exports[name]}', __name__), name)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from .checks import criteria_columns
+from .rules import failure_mask
+
+# Server-side filtering and paging of a finished report. ResultIndex is
+# built once per analysis: for every filterable column it keeps the row
+# positions of each value (and the failure bitmask of each row, over
+# failure_columns), so applying a filter is a few boolean mask operations
+# and only the requested page is sliced out of the report. The checks
+# never run again.
+
+filter_columns = ['Manager', 'Tech', 'Marked Ready']
+
+class ResultIndex:
+    def __init__(self, df_output, tech=None):
+        self.frame = df_output
+        self.size = len(df_output)
+        columns = {
+            'Manager': df_output['Manager'],
+            'Tech': tech if tech is not None else pd.Series(None, index=df_output.index, dtype=object),
+            'Marked Ready': df_output['Marked Ready'],
+        }
+        self.groups = {name: self._positions(values) for name, values in columns.items()}
+        self.scores = self._positions(df_output['Score'])
+        self.failure_columns = [col for col in criteria_columns if col in df_output.columns]
+        self.failures = failure_mask(df_output)
+
+    @staticmethod
+    def _positions(values):
+        values = pd.Series(values.to_numpy(), dtype=object).fillna('(none)')
+        return {key: positions for key, positions in values.groupby(values, sort=True).indices.items()}
+
+    def options(self, name):
+        return list(self.groups[name])
+
+    def max_score(self):
+        return max(self.scores, default=0)
+
+    def _mask(self, position_lists):
+        mask = np.zeros(self.size, dtype=bool)
+        for positions in position_lists:
+            mask[positions] = True
+        return mask
+
+    def select(self, values=None, min_score=0, failing=()):
+        # Row positions (in report order) matching every active filter:
+        # values maps a filter column to the values to keep, failing keeps
+        # visits that failed any of the given criteria columns.
+        mask = np.ones(self.size, dtype=bool)
+        for name, wanted in (values or {}).items():
+            if wanted:
+                groups = self.groups[name]
+                mask &= self._mask(groups[value] for value in wanted if value in groups)
+        if min_score > 0:
+            mask &= self._mask(positions for score, positions in self.scores.items() if score >= min_score)
+        if failing:
+            bits = sum(1 << criteria_columns.index(col) for col in set(failing) if col in self.failure_columns)
+            mask &= (self.failures & bits) != 0
+        return np.flatnonzero(mask)
+
+    def page(self, positions, page, rows):
+        return self.frame.iloc[positions[page * rows:(page + 1) * rows]]
@@ -0,0 +1,180 @@
+import pandas as pd
+
+from .keywords import exclusion_phrases, followup_keywords, inventory_keywords, phosphate_treatments
+from .roster import manager_of, tech_columns, unassigned, visit_day
+from .spelling import is_issue
+
+# ---------- CHECK FUNCTIONS ----------
+
+def check_range(val, low, high):
+    if pd.isna(val): return 'NA'
+    if val < low: return 'Low Chlorine'
+    if val > high: return 'High Chlorine'
+    return 'Pass'
+
+def check_chlorine_range(row):
+    return check_range(row.get('Free Chlorine Reading'), 3, 8)
+
+def check_cya_range(row):
+    val = row.get('Cyanuric Acid Reading')
+    items = str(row.get('Items Used', '')).lower()
+    if pd.isna(val): return 'NA'
+    if val < 40:
+        return 'Low and Adjusted' if 'stabilizer' in items else 'Fail'
+    elif val > 80:
+        return 'High CYA'
+    else:
+        return 'Pass'
+
+def check_phosphate_range(row):
+    val = row.get('Phosphorus Reading')
+    items = str(row.get('Items Used', '')).lower()
+    if pd.isna(val): return 'NA'
+    if any(k in items for k in phosphate_treatments):
+        return 'Pass'
+    return 'Fail' if val >= 600 else 'Pass'
+
+def check_color_condition(row):
+    cond = row.get('Water Condition Reading')
+    color = row.get('Water Color Reading')
+    if pd.isna(cond) or pd.isna(color): return 'NA'
+    issues = []
+    if cond != 'Crystal Clear': issues.append(cond)
+    if color != 'Blue': issues.append(color)
+    return f"Fail - {', '.join(issues)}" if issues else 'Pass'
+
+def check_filter_pressure(row):
+    val = row.get('Filter Pressure')
+    if pd.isna(val): return 'NA'
+    if val == 0: return 'Fail'
+    if val < 5: return 'Low Pressure'
+    if val > 22: return 'High Pressure'
+    return 'Pass'
+
+def check_system_primed(row):
+    value = str(row.get('System Primed and Running', '')).strip().lower()
+    return 'Fail' if value == 'no' else 'Pass'
+
+def check_followup(row):
+    status = row.get('Service Status')
+    return 'Pass' if status == 'Complete' else 'Fail' if pd.notna(status) else 'NA'
+
+def check_items_inventory(row):
+    notes = f"{row.get('Private Notes', '')}{row.get('Customer Notes', '')}".lower()
+    used = str(row.get('Items Used', '')).lower()
+    if 'chem' in used:
+        return 'Pass'
+    if any(k in notes for k in inventory_keywords) and not any(k in used for k in inventory_keywords):
+        return 'Fail'
+    return 'Pass' if notes.strip() else 'NA'
+
+def check_note_followup(row):
+    notes = f"{row.get('Private Notes', '')} {row.get('Customer Notes', '')}".lower()
+    if any(phrase in notes for phrase in exclusion_phrases):
+        return 'Pass'
+    return 'Fail' if any(k in notes for k in followup_keywords) else 'Pass' if notes.strip() else 'NA'
+
+def check_add_notes_next_visit(row):
+    value = row.get('Add Notes for Next Visit', False)
+    if value is True or str(value).strip().lower() == 'true' or value == 1:
+        return 'Fail'
+    return ''
+
+def check_quote_needed(row):
+    value = row.get('Quote needed?', False)
+    if value is True or str(value).strip().lower() == 'true' or value == 1:
+        return 'Fail'
+    return ''
+
+def check_chlorine_added(row):
+    val = row.get('Free Chlorine Reading')
+    items = str(row.get('Items Used', '')).lower()
+    if pd.isna(val): return 'NA'
+    if val < 3:
+        return 'Pass' if 'shock' in items else 'Fail'
+    return 'Pass'
+
+def assign_manager(row):
+    start = row.get('Start Time')
+    day = visit_day(start if pd.notna(start) else '')
+    for first_col, last_col in tech_columns:
+        first, last = (str(row.get(col)).strip() if pd.notna(row.get(col)) else '' for col in (first_col, last_col))
+        manager = manager_of(first, last, day) if first else None
+        if manager is not None:
+            return manager
+    return unassigned
+
+def check_water_sample(row):
+    return 'Sample to Test' if pd.notna(row.get('Water Samples')) and str(row.get('Water Samples')).strip() != '' else ''
+
+def spelling_rank(row):
+    note = str(row.get('Customer Notes', '')).strip()
+    if not note:
+        return 3
+    words = note.split()
+    issues = sum(1 for i, word in enumerate(words) if is_issue(word, i == 0 or words[i - 1].endswith(('.', '!', '?'))))
+    if issues > 4 or len(words) < 3:
+        return 1
+    elif issues > 1:
+        return 2
+    return 3
+
+criteria_columns = [
+    'Chlorine Range', 'CYA Range', 'Phosphate Range Untreated', 'Color And Condition',
+    'Filter Pressure', 'System Primed', 'Followup', 'Items added to inventory?',
+    'Note Followup Criteria', 'Chlorine Added'
+]
+
+def compute_action_items(row):
+    items = [f"{col}: {row[col]}" for col in criteria_columns if row[col] == 'Fail']
+    if row.get('Water Sample') == 'Sample to Test':
+        items.append('Water Sample: Sample to Test')
+    return ', '.join(items)
+
+def calculate_score(row):
+    return sum(row[col] == 'Fail' for col in criteria_columns)
+
+def determine_marked_ready(row):
+    billing = str(row.get('Billing Status', '')).strip().lower()
+    inventory = row.get('Items added to inventory?')
+    followup = row.get('Note Followup Criteria')
+    if billing == 'not billed': return ''
+    if billing == 'ready' and (inventory == 'Fail' or followup == 'Fail'):
+        return 'Yes'
+    if billing == 'ready': return 'Ready'
+    return ''
+
+
+# ---------- ROW-WISE PIPELINE ----------
+
+# Reference pipeline: one df.apply(axis=1) pass per criteria column, in the
+# same order scanapp.py originally ran them. scanner.rules.evaluate must
+# produce identical output.
+row_checks = [
+    ('Manager', assign_manager),
+    ('Chlorine Range', check_chlorine_range),
+    ('CYA Range', check_cya_range),
+    ('Phosphate Range Untreated', check_phosphate_range),
+    ('Color And Condition', check_color_condition),
+    ('Filter Pressure', check_filter_pressure),
+    ('System Primed', check_system_primed),
+    ('Followup', check_followup),
+    ('Items added to inventory?', check_items_inventory),
+    ('Note Followup Criteria', check_note_followup),
+    ('Add Notes for Next Visit', check_add_notes_next_visit),
+    ('Quote needed?', check_quote_needed),
+    ('Chlorine Added', check_chlorine_added),
+    ('Water Sample', check_water_sample),
+    ('Spelling Rank (1-3)', spelling_rank),
+    ('Marked Ready', determine_marked_ready),
+    ('Action Items', compute_action_items),
+    ('Score', calculate_score),
+]
+
+def apply_rowwise(df_filtered):
+    df_filtered = df_filtered.copy()
+    for col, func in row_checks:
+        df_filtered[col] = df_filtered.apply(func, axis=1)
+        if col == 'Manager':
+            df_filtered['Manager - Tech - Duration'] = df_filtered['Manager'].astype(object) + ' - ' + df_filtered['Tech 1 First Name'].astype(object) + ' - ' + df_filtered['Duration'].astype(str).astype(object)
+    return df_filtered
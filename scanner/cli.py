@@ -0,0 +1,108 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import export
+from .ingest import MissingColumnsError, read_original, read_services
+from .pipeline import analyze, analyze_stream, open_store
+from .rollups import RollupStore
+
+# Batch entry point: python -m scanner EXPORT.csv [DIR ...] --out reports/
+# Every CSV (or every *.csv inside a directory) is analyzed in its own worker
+# process and written next to the others as <name>_analysis.{xlsx,png,csv}
+# (plus <name>_analysis_pages.zip when the PNG preview does not fit one page).
+
+formats = ['xlsx', 'png', 'csv']
+
+def collect_inputs(paths):
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            inputs.extend(sorted(glob.glob(os.path.join(path, '*.csv'))))
+        else:
+            inputs.append(path)
+    return inputs
+
+def process_file(path, out_dir, selected, chunksize=None, original=False, page_rows=export.PAGE_ROWS,
+                 store_path=None, rollups_path=None):
+    start = time.perf_counter()
+    store = open_store(store_path) if store_path else None
+    rollups = RollupStore(rollups_path) if rollups_path else None
+    try:
+        if chunksize:
+            analysis = analyze_stream(path, chunksize, store, rollups)
+        else:
+            analysis = analyze(read_services(path), store, rollups)
+    finally:
+        for db in (store, rollups):
+            if db is not None:
+                db.close()
+    stem = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + '_analysis')
+
+    written = []
+    if 'xlsx' in selected:
+        export.write_excel(stem + '.xlsx', analysis.output, read_original(path) if original else None,
+                           reconciliation=analysis.reconciliation)
+        written.append(stem + '.xlsx')
+    if 'png' in selected:
+        with open(stem + '.png', 'wb') as f:
+            f.write(export.table_image(export.top_rows(analysis.output, page_rows)))
+        written.append(stem + '.png')
+        if len(analysis.output) > page_rows:
+            with open(stem + '_pages.zip', 'wb') as f:
+                f.write(export.table_images_zip(analysis.output, page_rows))
+            written.append(stem + '_pages.zip')
+    if 'csv' in selected:
+        analysis.output.to_csv(stem + '.csv', index=False)
+        written.append(stem + '.csv')
+    return path, len(analysis.output), written, time.perf_counter() - start, analysis.stats
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m scanner', description='Analyze pool service CSV exports.')
+    parser.add_argument('paths', nargs='+', help='CSV exports or directories of exports')
+    parser.add_argument('-o', '--out', default='.', help='output directory (default: current directory)')
+    parser.add_argument('-f', '--formats', default='xlsx,csv',
+                        help=f"comma-separated outputs from {', '.join(formats)} (default: xlsx,csv)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='worker processes (default: all cores)')
+    parser.add_argument('--chunksize', type=int, help='stream each file in chunks of this many rows')
+    parser.add_argument('--page-rows', type=int, default=export.PAGE_ROWS,
+                        help='rows per PNG page; png writes the top rows by Score plus a zip of all pages')
+    parser.add_argument('--store', help='SQLite file of per-visit results; only new or changed visits are re-checked')
+    parser.add_argument('--rollups', help='SQLite file of per-day Manager/Tech rollups to update for trend queries')
+    parser.add_argument('--original', action='store_true', help="include the 'Original Data' sheet in the workbook")
+    args = parser.parse_args(argv)
+
+    args.formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = sorted(set(args.formats) - set(formats))
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+    return args
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    inputs = collect_inputs(args.paths)
+    if not inputs:
+        print('No CSV exports found.', file=sys.stderr)
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+
+    failed = 0
+    jobs = max(1, min(args.jobs or 1, len(inputs)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(process_file, path, args.out, args.formats, args.chunksize, args.original, args.page_rows, args.store, args.rollups): path
+            for path in inputs
+        }
+        for future, path in futures.items():
+            try:
+                _, rows, written, seconds, stats = future.result()
+            except (MissingColumnsError, OSError, ValueError) as e:
+                failed += 1
+                print(f'{path}: FAILED: {e}', file=sys.stderr)
+                continue
+            reuse = f" ({stats['evaluated']} checked, {stats['reused']} reused)" if stats else ''
+            print(f"{path}: {rows} visits{reuse} in {seconds:.2f}s -> {', '.join(written)}")
+    return 1 if failed else 0
@@ -0,0 +1,203 @@
+import io
+import os
+import re
+import zipfile
+
+from . import profiling, startup
+
+# Report builders shared by the Streamlit app and the batch CLI. Both return
+# the finished file as bytes. matplotlib and xlsxwriter are imported on
+# first use so neither is loaded at startup.
+
+highlight_values = ['Fail', 'Yes', 'Low Pressure', 'High Pressure', 'Sample to Test']
+
+highlight_columns = [
+    'Items added to inventory?', 'Note Followup Criteria', 'Chlorine Added',
+    'CYA Range', 'Phosphate Range Untreated', 'Marked Ready', 'Filter Pressure',
+    'System Primed', 'Water Sample', 'Add Notes for Next Visit', 'Quote needed?'
+]
+
+# ---------- EXCEL ----------
+
+# Rows are streamed through xlsxwriter's constant_memory mode, which flushes
+# each row to disk once the next one starts, and highlighting is a single
+# conditional format per column instead of a rewrite of every matching
+# cell. Build time and memory stay linear in the number of rows.
+
+EXCEL_BLOCK_ROWS = 10_000
+
+reconciliation_sheet = 'Truck Reconciliation'
+
+def _write_frame(worksheet, frame, header_format):
+    worksheet.write_row(0, 0, [str(col) for col in frame.columns], header_format)
+    row = 1
+    for start in range(0, len(frame), EXCEL_BLOCK_ROWS):
+        block = frame.iloc[start:start + EXCEL_BLOCK_ROWS].astype(object)
+        block = block.where(block.notna(), None)
+        for values in block.itertuples(index=False, name=None):
+            worksheet.write_row(row, 0, values)
+            row += 1
+
+def _highlight_formula(cell):
+    return '=OR(' + ','.join(f'TRIM({cell})="{value}"' for value in highlight_values) + ')'
+
+def sheet_names(labels, taken=()):
+    # Valid, unique worksheet names: at most 31 characters, none of []:*?/\
+    # and no case-insensitive repeats (of each other or of `taken`).
+    used = {name.lower() for name in taken}
+    names = []
+    for label in labels:
+        base = re.sub(r'[\[\]:*?/\\]', '_', os.path.splitext(str(label))[0]).strip("' ")[:31] or 'Sheet'
+        name, n = base, 1
+        while name.lower() in used:
+            n += 1
+            name = f'{base[:31 - len(str(n)) - 1]}~{n}'
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+def write_excel(target, df_output, df_original=None, split_by=None, reconciliation=None):
+    # split_by adds one sheet per value of that column (e.g. one per branch
+    # export) after the combined Analysis Results sheet. reconciliation
+    # (scanner.reconcile) gets a Truck Reconciliation sheet after those.
+    with profiling.stage('Excel export', len(df_output)):
+        _write_excel(target, df_output, df_original, split_by, reconciliation)
+
+def _write_results(workbook, name, df_output, formats):
+    from xlsxwriter.utility import xl_rowcol_to_cell
+
+    worksheet = workbook.add_worksheet(name)
+    worksheet.set_column('A:F', 20, formats['wrap'])
+    for col_idx in range(2, len(df_output.columns)):
+        width = 45 if df_output.columns[col_idx] in ['Action Items', 'Manager - Tech - Duration'] else 12
+        worksheet.set_column(col_idx, col_idx, width, formats['center'])
+
+    last_row = max(len(df_output), 1)
+    for col in highlight_columns:
+        if col in df_output.columns:
+            idx = df_output.columns.get_loc(col)
+            worksheet.conditional_format(1, idx, last_row, idx, {
+                'type': 'formula',
+                'criteria': _highlight_formula(xl_rowcol_to_cell(1, idx)),
+                'format': formats['red'],
+            })
+    _write_frame(worksheet, df_output, formats['header'])
+
+def _write_reconciliation(workbook, df_truck, formats):
+    from xlsxwriter.utility import xl_rowcol_to_cell
+
+    worksheet = workbook.add_worksheet(reconciliation_sheet)
+    worksheet.set_column(0, len(df_truck.columns) - 1, 12, formats['center'])
+    for col in ['Tech', 'Mileage Check', 'Chemical Check']:
+        idx = df_truck.columns.get_loc(col)
+        worksheet.set_column(idx, idx, 30 if col == 'Chemical Check' else 20, formats['wrap'])
+        if col != 'Tech':
+            cell = xl_rowcol_to_cell(1, idx)
+            worksheet.conditional_format(1, idx, max(len(df_truck), 1), idx, {
+                'type': 'formula', 'criteria': f'=LEFT({cell},4)="Fail"', 'format': formats['red'],
+            })
+    _write_frame(worksheet, df_truck, formats['header'])
+
+def _write_excel(target, df_output, df_original, split_by, reconciliation):
+    with startup.timed('import xlsxwriter'):
+        import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True})
+    formats = {
+        'header': workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}),
+        'wrap': workbook.add_format({'text_wrap': True}),
+        'center': workbook.add_format({'align': 'center', 'valign': 'vcenter'}),
+        'red': workbook.add_format({'bg_color': '#FFC7CE'}),
+    }
+
+    _write_results(workbook, 'Analysis Results', df_output, formats)
+    if split_by is not None and split_by in df_output.columns:
+        groups = list(df_output.groupby(split_by, observed=True))
+        names = sheet_names([key for key, _ in groups], taken=['Analysis Results', reconciliation_sheet, 'Original Data'])
+        for name, (_, group) in zip(names, groups):
+            _write_results(workbook, name, group, formats)
+
+    if reconciliation is not None:
+        _write_reconciliation(workbook, reconciliation, formats)
+
+    if df_original is not None:
+        _write_frame(workbook.add_worksheet('Original Data'), df_original, formats['header'])
+
+    workbook.close()
+
+def excel_report(df_output, df_original=None, split_by=None, reconciliation=None):
+    output = io.BytesIO()
+    write_excel(output, df_output, df_original, split_by, reconciliation)
+    return output.getvalue()
+
+# ---------- TABLE IMAGE ----------
+
+# Images are rendered one fixed-size page at a time, so the cost of a page
+# does not depend on how large the report is.
+
+PAGE_ROWS = 25
+
+def top_rows(df_output, n=PAGE_ROWS):
+    return df_output.sort_values('Score', ascending=False, kind='stable').head(n)
+
+def paginate(df_output, rows=PAGE_ROWS, by=None):
+    # [(label, page)], split every `rows` rows, optionally within each
+    # value of `by` (e.g. one run of pages per Manager).
+    groups = df_output.groupby(by, sort=False, observed=True) if by else [(None, df_output)]
+    pages = []
+    for key, group in groups:
+        count = -(-len(group) // rows)
+        for i in range(count):
+            label = f'{key} - page {i + 1} of {count}' if by else f'page {i + 1} of {count}'
+            pages.append((label, group.iloc[i * rows:(i + 1) * rows]))
+    return pages
+
+def table_image(df_display):
+    with profiling.stage('table image', len(df_display)):
+        return _table_image(df_display)
+
+def _table_image(df_display):
+    with startup.timed('import matplotlib'):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+    # A figure of its own rather than pyplot's global one: download buttons
+    # render on Streamlit's callback threads, concurrently with the script.
+    fig = Figure(figsize=(20, (len(df_display) + 1) * 0.5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.axis('off')
+
+    # Create table
+    table = ax.table(cellText=df_display.values,
+                      colLabels=df_display.columns,
+                      cellLoc='center',
+                      loc='center')
+
+    table.auto_set_font_size(False)
+    table.set_fontsize(8)
+    table.scale(1.2, 1.2)
+
+    # Highlight "Fail" and other key values
+    for (row, col), cell in table.get_celld().items():
+        if row == 0:
+            cell.set_fontsize(9)
+            cell.set_text_props(weight='bold')
+            cell.set_facecolor('#CCCCCC')
+        else:
+            val = df_display.iloc[row - 1, col]
+            if isinstance(val, str) and val.strip() in highlight_values:
+                cell.set_facecolor('#FFC7CE')
+
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', bbox_inches='tight')
+    return img_buffer.getvalue()
+
+def table_images_zip(df_output, rows=PAGE_ROWS, by=None):
+    output = io.BytesIO()
+    # PNGs are already compressed; store them as-is.
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as archive:
+        for i, (label, page) in enumerate(paginate(df_output, rows, by), start=1):
+            name = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_')
+            archive.writestr(f'{i:04d}_{name}.png', table_image(page))
+    return output.getvalue()
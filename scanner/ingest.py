@@ -0,0 +1,162 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import pandas as pd
+
+from . import profiling
+
+# Declared input schema. A services export has well over a hundred columns
+# but the checks only read the ones listed here, so everything else is
+# skipped at parse time. Readings are parsed straight to float64 and the
+# low-cardinality columns to categoricals. Columns left as None keep
+# pandas' inferred dtype because the checks depend on it (Duration is
+# rendered as text, the flag columns accept 1/True).
+
+numeric_columns = [
+    'Free Chlorine Reading', 'Cyanuric Acid Reading', 'Phosphorus Reading', 'Filter Pressure',
+]
+
+category_columns = [
+    'Service Type', 'Tech 1 First Name', 'Tech 1 Last Name', 'Tech 2 First Name', 'Tech 2 Last Name',
+    'Service Status', 'Billing Status',
+]
+
+text_columns = [
+    'Customer Name', 'Start Time', 'Private Notes', 'Customer Notes', 'Items Used',
+    'Water Condition Reading', 'Water Color Reading', 'Water Samples', 'System Primed and Running',
+]
+
+inferred_columns = ['Duration', 'Add Notes for Next Visit', 'Quote needed?']
+
+# Truck sheet columns, read for scanner.reconcile. They are empty on
+# every row but the admin sheets and read as floats like the readings,
+# which pyarrow parses several times faster than text. Techs type them in
+# by hand, though, so an export where one is not a number is read again
+# with them as text (scanner.reconcile coerces them either way).
+truck_chemicals = [
+    'Liquid Shock', 'Shock', 'Alkalinity', 'pH Up', 'pH Down', 'Calcium', 'Stabilizer',
+    'Chlorine Tabs', 'Salt Bags', 'Algaecide', 'Floc', 'Phosphate Remover', 'Clarifier',
+]
+mileage_columns = ['Beginning Mileage', 'Ending Mileage', 'End Of Day Mileage']
+truck_columns = [f'{chem} {side}' for chem in truck_chemicals for side in ('Loaded', 'Unloaded')] + mileage_columns
+
+START_TIME_FORMAT = '%m/%d/%Y %I:%M %p'
+
+schema = {
+    **{col: 'float64' for col in numeric_columns + truck_columns},
+    **{col: 'category' for col in category_columns},
+    **{col: str for col in text_columns},
+    **{col: None for col in inferred_columns},
+}
+
+# Without these the report cannot be built at all; every other schema
+# column is optional and its checks fall back to 'NA'.
+required_columns = ['Customer Name', 'Service Type', 'Duration', 'Tech 1 First Name']
+
+class MissingColumnsError(ValueError):
+    def __init__(self, missing, source=None):
+        # args stays (columns, source) so the error survives pickling
+        # (worker processes in the batch CLI).
+        self.missing = list(missing)
+        self.source = source
+        super().__init__(self.missing, source)
+
+    def __str__(self):
+        where = f' in {self.source}' if self.source else ''
+        return f"Missing required column(s){where}: {', '.join(self.missing)}"
+
+def default_engine():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'c'
+    return 'pyarrow'
+
+def _source(source):
+    # Both passes (header, then data) need to read from the start.
+    if isinstance(source, (bytes, bytearray)):
+        return lambda: io.BytesIO(source)
+    if hasattr(source, 'seek'):
+        def rewind():
+            source.seek(0)
+            return source
+        return rewind
+    return lambda: source
+
+def read_header(source):
+    return list(pd.read_csv(_source(source)(), nrows=0).columns)
+
+def check_columns(columns):
+    missing = [col for col in required_columns if col not in columns]
+    if missing:
+        raise MissingColumnsError(missing)
+
+def check_header(source):
+    # Validates an export from its header alone, without parsing any rows.
+    check_columns(read_header(source))
+
+def _truck_text(dtype):
+    return {col: str if col in truck_columns else kind for col, kind in dtype.items()}
+
+def read_services(source, engine=None, columns=None):
+    open_source = _source(source)
+    header = read_header(source)
+    check_columns(header)
+
+    wanted = schema if columns is None else {col: schema.get(col) for col in columns}
+    usecols = [col for col in header if col in wanted]
+    dtype = {col: wanted[col] for col in usecols if wanted[col] is not None}
+    with profiling.stage('read_csv') as record:
+        try:
+            df = pd.read_csv(open_source(), usecols=usecols, dtype=dtype, engine=engine or default_engine())
+        except ValueError:
+            if not any(col in dtype for col in truck_columns):
+                raise
+            df = pd.read_csv(open_source(), usecols=usecols, dtype=_truck_text(dtype), engine=engine or default_engine())
+        record['rows'] = len(df)
+    return df
+
+def read_original(source):
+    # Full, unpruned frame for the optional "Original Data" sheet.
+    with profiling.stage('read_csv (original)') as record:
+        df = pd.read_csv(_source(source)())
+        record['rows'] = len(df)
+    return df
+
+def read_many(sources, reader=read_services, max_workers=None):
+    # One frame per (name, source), in order. Every export is parsed and
+    # validated on its own thread; both CSV engines release the GIL while
+    # parsing. A missing-columns error names the export it came from.
+    def read(name, source):
+        try:
+            return reader(source)
+        except MissingColumnsError as e:
+            raise MissingColumnsError(e.missing, name) from None
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        # Each task runs in a copy of the caller's context so profiling
+        # stages inside the workers are still collected.
+        futures = [pool.submit(copy_context().run, read, name, source) for name, source in sources]
+        return [future.result() for future in futures]
+
+def iter_services(source, chunksize):
+    # Same schema as read_services, in bounded chunks. The pyarrow engine
+    # cannot stream, so chunks always come from the C parser, which reads
+    # the truck columns as text just as fast (and a bad value cannot fail
+    # a later chunk).
+    open_source = _source(source)
+    header = read_header(source)
+    check_columns(header)
+
+    usecols = [col for col in header if col in schema]
+    dtype = _truck_text({col: schema[col] for col in usecols if schema[col] is not None})
+    with pd.read_csv(open_source(), usecols=usecols, dtype=dtype, chunksize=chunksize) as reader:
+        chunks = iter(reader)
+        while True:
+            with profiling.stage('read_csv') as record:
+                chunk = next(chunks, None)
+                record['rows'] = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                return
+            yield chunk
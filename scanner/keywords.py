@@ -0,0 +1,76 @@
+import re
+
+import pandas as pd
+
+# Keyword index shared by the checks that read free text. Items Used and the
+# joined Private/Customer Notes are lowercased once, then every keyword list
+# is matched in a single scan per text with one compiled alternation, so text
+# work grows with total text length rather than text length x keyword lists.
+
+# ---------- KEYWORD LISTS ----------
+
+phosphate_treatments = ['phosphate', 'phosfree', 'pool perfect']
+inventory_keywords = ['install', 'leave', 'using', 'sell', 'complete']
+followup_keywords = ['follow up', 'schedule', 'quote', 'return', 'next visit', 'need to come back']
+exclusion_phrases = ['have a good', 'see you next year', 'closed for the season']
+
+text_fields = {
+    'Items Used': ['stabilizer', 'shock', 'chem'] + phosphate_treatments + inventory_keywords,
+    'Notes': followup_keywords + exclusion_phrases,
+    'Inventory Notes': inventory_keywords,
+}
+
+# ---------- NORMALIZATION ----------
+
+def text_column(df, col):
+    # Mirrors str(row.get(col, '')): missing column -> '', NaN -> 'nan'.
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    s = df[col]
+    return s.astype(object).where(s.notna(), 'nan').astype(str)
+
+def normalize(df):
+    private, customer = text_column(df, 'Private Notes'), text_column(df, 'Customer Notes')
+    return pd.DataFrame({
+        'Items Used': text_column(df, 'Items Used').str.lower(),
+        'Notes': (private + ' ' + customer).str.lower(),
+        # The inventory check has always joined the two fields directly.
+        'Inventory Notes': (private + customer).str.lower(),
+    }, index=df.index)
+
+# ---------- MATCHING ----------
+
+def compile_matcher(keywords):
+    # Zero-width lookahead so overlapping keywords are all reported; each
+    # keyword gets its own named group (k0, k1, ...) in list order. Longer
+    # keywords are tried first so a prefix never shadows them.
+    order = sorted(range(len(keywords)), key=lambda i: -len(keywords[i]))
+    alternatives = '|'.join(f'(?P<k{i}>{re.escape(keywords[i])})' for i in order)
+    return re.compile(f'(?=(?:{alternatives}))')
+
+_matchers = {field: compile_matcher(keywords) for field, keywords in text_fields.items()}
+
+def match(text, keywords, matcher=None):
+    matcher = matcher or compile_matcher(keywords)
+    positions = pd.RangeIndex(len(text))
+    found = pd.Series(text.to_numpy(), index=positions).str.extractall(matcher)
+    hits = found.notna().groupby(level=0).any().reindex(positions, fill_value=False)
+    hits = hits.rename(columns=lambda name: keywords[int(name[1:])])[keywords]
+    hits.index = text.index
+    # A lookahead reports one alternative per start position, so a keyword
+    # that is a prefix of a longer one is implied by the longer one's hit.
+    for short in keywords:
+        for long in keywords:
+            if long != short and long.startswith(short):
+                hits[short] |= hits[long]
+    return hits.astype(bool)
+
+def keyword_index(df):
+    text = normalize(df)
+    return pd.concat(
+        {field: match(text[field], keywords, _matchers[field]) for field, keywords in text_fields.items()},
+        axis=1
+    )
+
+def any_hit(hits, field, keywords):
+    return hits[field][keywords].any(axis=1)
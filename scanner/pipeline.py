@@ -0,0 +1,219 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .checks import criteria_columns
+from .ingest import category_columns, check_header, iter_services, read_many, read_original, schema, truck_columns
+from .reconcile import combine_reconciliation, finish_reconciliation, partial_reconciliation
+from .rules import compact, evaluate, results_version
+from .store import ResultStore, input_hashes, visit_keys
+
+# ---------- REPORT LAYOUT ----------
+
+excluded = [
+    'note', 'admin-end of day checklist', 'admin-load sheets',
+    'admin-office task', 'admin-warehouse work - technicians'
+]
+
+output_columns = [
+    'Customer Name', 'Service Type', 'Manager - Tech - Duration', 'Score', 'Marked Ready',
+    'Action Items', 'Add Notes for Next Visit', 'Quote needed?', 'Spelling Rank (1-3)', 'Water Sample',
+    'Chlorine Range', 'Chlorine Added', 'CYA Range', 'Phosphate Range Untreated',
+    'Color And Condition', 'Filter Pressure', 'System Primed', 'Followup',
+    'Items added to inventory?', 'Note Followup Criteria', 'Manager'
+]
+
+summary_keys = {'Manager': 'Manager', 'Tech': 'Tech 1 First Name'}
+
+# Added to the report (and summarized) when several exports are combined.
+source_column = 'Source File'
+
+# Everything needed to rebuild the report and summaries for a visit.
+stored_columns = output_columns + ['Tech 1 First Name', 'Duration', 'Start Time']
+
+# A stored result is reused while these are unchanged. The truck columns
+# only feed the reconciliation (and their dtype differs between batch and
+# streaming reads), so they are left out.
+hashed_columns = [col for col in schema if col not in truck_columns]
+
+# stats counts visits evaluated vs. reused from a ResultStore. tech is the
+# Tech 1 First Name of each report row, which the report itself omits.
+# reconciliation is the truck chemical and mileage check per tech per day.
+Analysis = namedtuple(
+    'Analysis', ['output', 'summaries', 'stats', 'tech', 'reconciliation'], defaults=[None, None, None]
+)
+
+tech_column = 'Tech 1 First Name'
+
+def filter_services(df):
+    with profiling.stage('exclusion filter', len(df)):
+        return df[~df['Service Type'].astype(str).str.strip().str.lower().isin(excluded)]
+
+def sort_output(df_output):
+    return df_output.sort_values(by=['Manager', 'Score'], ascending=[True, False])
+
+def report_columns(df):
+    return ([source_column] if source_column in df.columns else []) + output_columns
+
+def _report(df_report, summaries, stats, reconciliation=None):
+    # df_report holds the report columns plus Tech, in any order of rows.
+    df_report = sort_output(df_report)
+    return Analysis(df_report.drop(columns=tech_column), summaries, stats, df_report[tech_column], reconciliation)
+
+def report_summary_keys(df):
+    return {**summary_keys, source_column: source_column} if source_column in df.columns else summary_keys
+
+# ---------- MULTIPLE EXPORTS ----------
+
+# Branches export overlapping date ranges, so the same visit can appear in
+# several files. Exports are combined in the order given and each visit is
+# kept from the first export it appears in.
+
+def _stack(names, frames):
+    # One frame with the export name in front; its categories keep the
+    # order the exports were given in.
+    df = pd.concat(frames, ignore_index=True)
+    labels = np.repeat(np.array(names, dtype=object), [len(frame) for frame in frames])
+    source = pd.DataFrame({source_column: pd.Categorical(labels, categories=list(dict.fromkeys(names)))}, index=df.index)
+    return pd.concat([source, df], axis=1)
+
+def _restore_categories(df):
+    # concat falls back to object when the files' categories differ.
+    for col in category_columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def combine_exports(names, frames):
+    with profiling.stage('combine exports', sum(len(frame) for frame in frames)):
+        df = _stack(names, frames)
+        return _restore_categories(df[~visit_keys(df).duplicated()])
+
+def read_exports(exports, max_workers=None):
+    # exports is [(name, source)]; all files are parsed concurrently.
+    return combine_exports([name for name, _ in exports], read_many(exports, max_workers=max_workers))
+
+def read_original_exports(exports, max_workers=None):
+    # Unpruned and not deduplicated: the Original Data sheet shows the
+    # files as uploaded.
+    return _stack([name for name, _ in exports], read_many(exports, read_original, max_workers))
+
+def iter_exports(exports, chunksize):
+    # Streaming counterpart of read_exports: one file after another, with
+    # the identities of every visit already yielded kept to drop repeats.
+    # Every header is checked before the first chunk, so a bad file is
+    # reported by name before any other file is processed.
+    read_many(exports, check_header)
+    seen = set()
+    start = 0
+    names = list(dict.fromkeys(name for name, _ in exports))
+    for name, source in exports:
+        for chunk in iter_services(source, chunksize):
+            # Same row labels as the ignore_index concat in combine_exports.
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            keys = visit_keys(chunk)
+            fresh = ~keys.duplicated().to_numpy() & np.fromiter((k not in seen for k in keys), dtype=bool, count=len(keys))
+            seen.update(keys[fresh])
+            chunk = chunk[fresh]
+            chunk.insert(0, source_column, pd.Categorical([name] * len(chunk), categories=names))
+            yield chunk
+
+# ---------- SUMMARIES ----------
+
+# Summaries are kept as additive partial sums so chunks can be folded in
+# one at a time; finish_summary derives the averages at the end.
+
+def partial_summary(df_evaluated, key):
+    keys = df_evaluated[key].astype(object).fillna('(none)').rename(key)
+    partial = df_evaluated[criteria_columns].eq('Fail').groupby(keys).sum()
+    partial.insert(0, 'Visits', keys.groupby(keys).size())
+    # Score is int8; a chunk's sum can still fit, and then adding up the
+    # chunks would wrap around.
+    partial.insert(1, 'Total Score', df_evaluated['Score'].astype('int64').groupby(keys).sum())
+    partial.insert(2, 'Total Duration', pd.to_numeric(df_evaluated['Duration'], errors='coerce').groupby(keys).sum())
+    return partial
+
+def combine_summary(total, partial):
+    return partial if total is None else total.add(partial, fill_value=0)
+
+def finish_summary(total):
+    total = total.round().astype('int64')
+    total.insert(2, 'Average Score', (total['Total Score'] / total['Visits']).round(2))
+    return total.sort_index()
+
+# ---------- INCREMENTAL ----------
+
+def open_store(path):
+    return ResultStore(path, stored_columns, results_version())
+
+def evaluate_incremental(df_filtered, store, stats):
+    # Only visits that are new to the store, or whose inputs changed since
+    # they were stored, go through the rules; the rest are read back.
+    keys = visit_keys(df_filtered)
+    hashes = input_hashes(df_filtered, hashed_columns)
+    stored = store.lookup(keys)
+    known = keys.map(stored['input_hash']).eq(hashes)
+
+    fresh = evaluate(df_filtered[~known])[stored_columns]
+    store.save(keys[~known], hashes[~known], fresh)
+
+    reused = stored.loc[keys[known], stored_columns].set_axis(df_filtered.index[known])
+    stats['evaluated'] = stats.get('evaluated', 0) + len(fresh)
+    stats['reused'] = stats.get('reused', 0) + len(reused)
+    if reused.empty:
+        return fresh
+    return compact(pd.concat([fresh, reused]).reindex(df_filtered.index))
+
+# ---------- ANALYSIS ----------
+
+def _evaluate(df_filtered, store, stats):
+    with profiling.stage('criteria checks', len(df_filtered)):
+        if store is None:
+            return evaluate(df_filtered)
+        df_evaluated = evaluate_incremental(df_filtered, store, stats)
+    if source_column in df_filtered.columns:
+        df_evaluated[source_column] = df_filtered[source_column]
+    return df_evaluated
+
+def analyze(df, store=None, rollups=None):
+    stats = {}
+    df_filtered = filter_services(df)
+    df_evaluated = _evaluate(df_filtered, store, stats)
+    if rollups is not None:
+        rollups.update(df_evaluated)
+    summaries = {name: finish_summary(partial_summary(df_evaluated, key)) for name, key in report_summary_keys(df_evaluated).items()}
+    reconciliation = finish_reconciliation(partial_reconciliation(df, df_filtered))
+    return _report(df_evaluated[report_columns(df_evaluated) + [tech_column]], summaries, stats, reconciliation)
+
+def analyze_stream(source, chunksize=50_000, store=None, rollups=None):
+    # Peak memory is bounded by the chunk: each chunk is filtered and
+    # evaluated on its own and only the report columns and the summary
+    # partial sums are kept. A list of (name, source) pairs streams several
+    # exports as one, like read_exports.
+    multiple = isinstance(source, (list, tuple))
+    chunks = iter_exports(source, chunksize) if multiple else iter_services(source, chunksize)
+    parts = []
+    stats = {}
+    totals = {}
+    truck = None
+    for chunk in chunks:
+        df_filtered = filter_services(chunk)
+        df_evaluated = _evaluate(df_filtered, store, stats)
+        if rollups is not None:
+            rollups.update(df_evaluated)
+        parts.append(df_evaluated[report_columns(df_evaluated) + [tech_column]])
+        for name, key in report_summary_keys(df_evaluated).items():
+            totals[name] = combine_summary(totals.get(name), partial_summary(df_evaluated, key))
+        truck = combine_reconciliation(truck, partial_reconciliation(chunk, df_filtered))
+        del chunk, df_filtered, df_evaluated
+
+    columns = ([source_column] if multiple else []) + output_columns + [tech_column]
+    df_report = pd.concat(parts) if parts else pd.DataFrame(columns=columns)
+    if multiple and parts:
+        df_report = _restore_categories(df_report)
+    df_report = compact(df_report)
+    summaries = {name: finish_summary(total) for name, total in totals.items()}
+    return _report(df_report, summaries, stats, finish_reconciliation(truck))
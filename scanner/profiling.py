@@ -0,0 +1,104 @@
+import json
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# Per-stage diagnostics. The pipeline wraps each stage in stage(); nothing
+# is measured unless a collect() block is active in the calling context, in
+# which case every stage records wall time, rows processed and peak memory
+# and is logged as one JSON line:
+#
+#     with profiling.collect() as records:
+#         analyze(read_services(path))
+#
+# Peak memory is the process's resident high-water mark above its size at
+# stage entry, so Arrow and numpy buffers count too. It is read from
+# /proc (Linux) and reset per stage through clear_refs, which costs next to
+# nothing; tracemalloc would slow matplotlib down several times over. Where
+# /proc is unavailable peak_mb is None.
+
+log = logging.getLogger(__name__)
+
+_records = ContextVar('profiling_records', default=None)
+_open = ContextVar('profiling_open', default=())
+
+def _memory():
+    # (current, peak) resident set size in kB, or None.
+    try:
+        with open('/proc/self/status') as f:
+            fields = dict(line.split(':', 1) for line in f)
+        return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _reset_peak():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+def stage(name, rows=None):
+    if _records.get() is None:
+        # A fresh record per call, so writes to it are dropped with it.
+        return nullcontext({})
+    return _measure(name, rows)
+
+@contextmanager
+def _measure(name, rows):
+    parents = _open.get()
+    memory = _memory()
+    if memory is not None:
+        if parents:
+            # Resetting the peak below would lose the parent's high-water mark.
+            parents[-1]['_peak'] = max(parents[-1]['_peak'], memory[1])
+        _reset_peak()
+    current = memory[0] if memory else 0
+    record = {'stage': name, 'rows': rows, 'depth': len(parents), '_base': current, '_peak': current}
+    _records.get().append(record)
+    token = _open.set(parents + (record,))
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        seconds = time.perf_counter() - start
+        _open.reset(token)
+        memory = _memory()
+        peak = max(record.pop('_peak'), memory[1] if memory else 0)
+        if parents:
+            parents[-1]['_peak'] = max(parents[-1]['_peak'], peak)
+        base = record.pop('_base')
+        record['seconds'] = round(seconds, 4)
+        record['peak_mb'] = round((peak - base) / 1024, 2) if memory else None
+        log.info('stage %s', json.dumps(record))
+
+@contextmanager
+def collect(enabled=True):
+    # Yields the list the stages append to, in start order (a parent stage
+    # comes before its children). collect(False) yields an empty list and
+    # leaves profiling off.
+    records = []
+    if not enabled:
+        yield records
+        return
+    token = _records.set(records)
+    try:
+        yield records
+    finally:
+        _records.reset(token)
+
+def summarize(records):
+    # One row per stage name in first-run order; repeated stages (one per
+    # chunk in streaming mode) are added up, peak memory is the largest.
+    totals = {}
+    for record in records:
+        total = totals.setdefault(record['stage'], {
+            'stage': record['stage'], 'depth': record['depth'], 'calls': 0, 'rows': 0, 'seconds': 0.0, 'peak_mb': 0.0,
+        })
+        total['calls'] += 1
+        total['rows'] += record['rows'] or 0
+        total['seconds'] = round(total['seconds'] + record['seconds'], 4)
+        if record['peak_mb'] is not None:
+            total['peak_mb'] = max(total['peak_mb'], record['peak_mb'])
+    return list(totals.values())
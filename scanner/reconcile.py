@@ -0,0 +1,215 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .ingest import truck_chemicals
+from .keywords import phosphate_treatments, text_column as _text
+from .roster import latest, visit_days
+
+# Truck chemical reconciliation. Techs record what they load onto the truck
+# (Admin-Load Sheets) and what they unload at the end of the day
+# (Admin-End of Day Checklist), plus the truck's mileage; what left the
+# truck should match what that day's visits list under Items Used. Like the
+# report summaries, everything is kept as additive partial sums per tech
+# per day, so streamed chunks fold in one at a time, and
+# finish_reconciliation compares and flags once at the end.
+
+sheet_types = ['admin-load sheets', 'admin-end of day checklist']
+end_of_day_type = 'admin-end of day checklist'
+
+# Items Used entries look like "8 (Chem: Granular Shock (lb))". Entries from
+# these categories count toward the first chemical whose keywords their
+# name contains; quantities are compared in the units they were entered in.
+chemical_categories = ['chem', 'cmb']
+chemical_keywords = [
+    ('Liquid Shock', ['liquid shock', 'liquid chlorine']),
+    ('Shock', ['shock']),
+    ('Stabilizer', ['stabilizer', 'cyanuric']),
+    ('Alkalinity', ['alkalinity', 'bicarb']),
+    ('pH Up', ['ph up', 'soda ash']),
+    ('pH Down', ['ph down', 'muriatic', 'acid']),
+    ('Calcium', ['calcium']),
+    ('Chlorine Tabs', ['tabs', 'tablet']),
+    ('Salt Bags', ['salt']),
+    ('Algaecide', ['algaecide']),
+    ('Floc', ['floc']),
+    ('Phosphate Remover', phosphate_treatments),
+    ('Clarifier', ['clarifier']),
+]
+
+# A chemical is flagged when what left the truck and what the visits used
+# differ by more than this share of the larger amount, and by more than
+# half a unit (so a single bag or tab is caught).
+relative_tolerance = 0.1
+absolute_tolerance = 0.5
+max_daily_miles = 300
+
+key_columns = ['Tech', 'Day']
+loaded_columns = [f'{chem} Loaded' for chem in truck_chemicals]
+unloaded_columns = [f'{chem} Unloaded' for chem in truck_chemicals]
+used_columns = [f'{chem} Used' for chem in truck_chemicals]
+_sum_columns = ['Visits', 'End of Day'] + loaded_columns + unloaded_columns + used_columns
+
+report_columns = [
+    'Tech', 'Day', 'Visits', 'Beginning Mileage', 'Ending Mileage', 'Miles', 'Mileage Check', 'Chemical Check'
+]
+
+_item = re.compile(r'(\d+(?:\.\d+)?)\s*\(((?:[^()]|\([^()]*\))*)\)')
+
+# ---------- ITEMS USED ----------
+
+@lru_cache(maxsize=1024)
+def chemical_of(name):
+    category, _, rest = name.partition(':')
+    if not rest or category.strip().lower() not in chemical_categories:
+        return None
+    rest = rest.lower()
+    return next((chem for chem, words in chemical_keywords if any(word in rest for word in words)), None)
+
+def chemicals_used(items):
+    # Quantity of each truck chemical per row (rows x truck_chemicals).
+    # Items Used repeats a lot, so each distinct text is parsed once.
+    codes, distinct = pd.factorize(items)
+    position = {chem: i for i, chem in enumerate(truck_chemicals)}
+    # The extra last row stays zero for missing values (code -1).
+    table = np.zeros((len(distinct) + 1, len(truck_chemicals)))
+    for row, text in enumerate(distinct):
+        for quantity, name in _item.findall(str(text)):
+            chem = chemical_of(name.strip())
+            if chem is not None:
+                table[row, position[chem]] += float(quantity)
+    return table[codes]
+
+# ---------- PARTIAL SUMS ----------
+
+def _numbers(df, col):
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[col], errors='coerce')
+
+def _name(df, col):
+    if col not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[col].astype(object).where(df[col].notna(), '').astype(str).str.strip()
+
+def _keys(df):
+    # Tech (first and last name) and day of every row, and which rows have
+    # both; the others cannot be placed and are dropped.
+    tech = (_name(df, 'Tech 1 First Name') + ' ' + _name(df, 'Tech 1 Last Name')).str.strip()
+    day = pd.Series(visit_days(df), index=df.index)
+    return tech, day, (tech.ne('') & day.ne(latest)).to_numpy()
+
+def _fold(frame):
+    # Combines rows with the same (Tech, Day): amounts add up, mileage
+    # keeps the first reading and the last.
+    grouped = frame.groupby(level=key_columns)
+    return pd.concat([
+        grouped[_sum_columns].sum(min_count=1),
+        grouped['Beginning Mileage'].min(),
+        grouped['Ending Mileage'].max(),
+    ], axis=1)
+
+def partial_reconciliation(df, df_visits):
+    # df is the unfiltered export, for its truck sheets; df_visits holds the
+    # service visits whose Items Used are reconciled against them.
+    with profiling.stage('truck reconciliation', len(df)):
+        return _partial(df, df_visits)
+
+def _partial(df, df_visits):
+    kind = _text(df, 'Service Type').str.strip().str.lower()
+    is_sheet = kind.isin(sheet_types).to_numpy()
+    sheets = df[is_sheet]
+    tech, day, placed = _keys(sheets)
+    sheet_rows = pd.DataFrame({
+        'Tech': tech, 'Day': day,
+        'End of Day': kind[is_sheet].eq(end_of_day_type).astype('int64'),
+        **{col: _numbers(sheets, col) for col in loaded_columns + unloaded_columns},
+        'Beginning Mileage': _numbers(sheets, 'Beginning Mileage'),
+        'Ending Mileage': _numbers(sheets, 'Ending Mileage').fillna(_numbers(sheets, 'End Of Day Mileage')),
+    })[placed]
+
+    tech, day, placed = _keys(df_visits)
+    visit_rows = pd.concat([
+        pd.DataFrame({'Tech': tech, 'Day': day, 'Visits': 1}),
+        pd.DataFrame(chemicals_used(_text(df_visits, 'Items Used')), index=df_visits.index, columns=used_columns),
+    ], axis=1)[placed]
+
+    rows = pd.concat([sheet_rows, visit_rows], ignore_index=True).reindex(
+        columns=key_columns + _sum_columns + ['Beginning Mileage', 'Ending Mileage']
+    )
+    return _fold(rows.set_index(key_columns))
+
+def combine_reconciliation(total, partial):
+    return partial if total is None else _fold(pd.concat([total, partial]))
+
+# ---------- FLAGS ----------
+
+def _fail_list(mask, labels):
+    # 'Fail - a, b' naming the labels set in each row of mask.
+    parts = np.full(len(mask), 'Fail - ', dtype=object)
+    for i, label in enumerate(labels):
+        parts += np.where(mask[:, i], f'{label}, ', '')
+    return pd.Series(parts).str.removesuffix(', ').to_numpy()
+
+def finish_reconciliation(total):
+    # One row per tech per day: visits, mileage, the two checks, and the
+    # loaded, unloaded and used amounts of every chemical that appears.
+    if total is None or total.empty:
+        return pd.DataFrame(columns=report_columns)
+    total = total.sort_index()
+
+    loaded = total[loaded_columns].to_numpy()
+    unloaded = total[unloaded_columns].to_numpy()
+    used = total[used_columns].fillna(0).to_numpy()
+    recorded = ~np.isnan(loaded) | ~np.isnan(unloaded)
+    # Unloaded amounts without a checklist row still close the day.
+    closed = (total['End of Day'].fillna(0).gt(0).to_numpy() | (~np.isnan(unloaded)).any(axis=1))
+    left_truck = np.nan_to_num(loaded) - np.nan_to_num(unloaded)
+    allowed = np.maximum(absolute_tolerance, relative_tolerance * np.maximum(np.abs(left_truck), used))
+    mismatched = recorded & closed[:, None] & (np.abs(left_truck - used) > allowed)
+
+    chemical_check = np.select(
+        [~recorded.any(axis=1), ~closed, mismatched.any(axis=1)],
+        ['NA', 'Fail - No end of day checklist', _fail_list(mismatched, truck_chemicals)],
+        default='Pass',
+    )
+
+    begin, end = total['Beginning Mileage'], total['Ending Mileage']
+    previous_end = end.groupby(level='Tech').shift()
+    miles = end - begin
+    mileage_check = np.select(
+        [
+            (begin.isna() & end.isna()).to_numpy(), end.isna().to_numpy(), begin.isna().to_numpy(),
+            (miles < 0).to_numpy(), (miles > max_daily_miles).to_numpy(), (begin < previous_end).to_numpy(),
+        ],
+        [
+            'NA', 'Fail - No ending mileage', 'Fail - No beginning mileage', 'Fail - Ending below beginning',
+            f'Fail - Over {max_daily_miles} miles', 'Fail - Below previous ending',
+        ],
+        default='Pass',
+    )
+
+    report = pd.DataFrame({
+        'Tech': total.index.get_level_values('Tech'),
+        'Day': total.index.get_level_values('Day').strftime('%Y-%m-%d'),
+        'Visits': total['Visits'].fillna(0).astype('int64').to_numpy(),
+        'Beginning Mileage': begin.to_numpy(),
+        'Ending Mileage': end.to_numpy(),
+        'Miles': miles.to_numpy(),
+        'Mileage Check': mileage_check,
+        'Chemical Check': chemical_check,
+    })
+    # Only chemicals that were loaded, unloaded or used at all get columns.
+    amounts = {}
+    for i, chem in enumerate(truck_chemicals):
+        if recorded[:, i].any() or used[:, i].any():
+            amounts[f'{chem} Loaded'] = loaded[:, i]
+            amounts[f'{chem} Unloaded'] = unloaded[:, i]
+            amounts[f'{chem} Used'] = used[:, i]
+    return pd.concat([report, pd.DataFrame(amounts, index=report.index)], axis=1)
+
+def reconcile(df, df_visits):
+    return finish_reconciliation(partial_reconciliation(df, df_visits))
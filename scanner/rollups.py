@@ -0,0 +1,96 @@
+import sqlite3
+
+import pandas as pd
+
+from .checks import criteria_columns
+from .ingest import START_TIME_FORMAT
+from .store import visit_keys
+
+# Materialized day x Manager x Tech rollups for trend queries. Every
+# analyzed visit is upserted into visit_facts (one row per visit identity,
+# so overlapping exports never double count), then the rollup rows of the
+# days that export touched are rebuilt from those facts with one GROUP BY.
+# Trend queries only read the small rollups table.
+
+_fail_columns = ', '.join(f'"{col}"' for col in criteria_columns)
+_fail_sums = ', '.join(f'SUM("{col}")' for col in criteria_columns)
+
+class RollupStore:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS visit_facts (visit_key INTEGER PRIMARY KEY, day TEXT NOT NULL, '
+                f'manager TEXT, tech TEXT, score INTEGER, duration REAL, {_fail_columns})'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS visit_facts_day ON visit_facts (day)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS rollups (day TEXT NOT NULL, manager TEXT, tech TEXT, '
+                f'visits INTEGER, total_score INTEGER, total_duration REAL, {_fail_columns}, '
+                'PRIMARY KEY (day, manager, tech))'
+            )
+
+    def update(self, df_evaluated):
+        days = pd.to_datetime(df_evaluated['Start Time'], format=START_TIME_FORMAT, errors='coerce').dt.strftime('%Y-%m-%d')
+        dated = days.notna()
+        if not dated.any():
+            return
+        df_evaluated = df_evaluated[dated]
+
+        facts = pd.DataFrame({
+            'visit_key': visit_keys(df_evaluated),
+            'day': days[dated],
+            'manager': df_evaluated['Manager'].astype(object),
+            'tech': df_evaluated['Tech 1 First Name'].astype(object).fillna('(none)'),
+            'score': df_evaluated['Score'],
+            'duration': pd.to_numeric(df_evaluated['Duration'], errors='coerce').fillna(0),
+        })
+        fails = df_evaluated[criteria_columns].eq('Fail').astype('int64')
+        facts = pd.concat([facts, fails], axis=1).astype(object)
+        rows = facts.where(facts.notna(), None).itertuples(index=False, name=None)
+        placeholders = ', '.join('?' * facts.shape[1])
+        touched = [(day,) for day in facts['day'].unique()]
+
+        with self.conn:
+            self.conn.executemany(f'INSERT OR REPLACE INTO visit_facts VALUES ({placeholders})', rows)
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS touched (day TEXT PRIMARY KEY)')
+            self.conn.execute('DELETE FROM touched')
+            self.conn.executemany('INSERT INTO touched VALUES (?)', touched)
+            self.conn.execute('DELETE FROM rollups WHERE day IN (SELECT day FROM touched)')
+            self.conn.execute(
+                f'INSERT INTO rollups SELECT day, manager, tech, COUNT(*), SUM(score), SUM(duration), {_fail_sums} '
+                'FROM visit_facts WHERE day IN (SELECT day FROM touched) GROUP BY day, manager, tech'
+            )
+
+    def query(self, start=None, end=None):
+        # Raw rollup rows, optionally limited to an inclusive day range.
+        sql, params = 'SELECT * FROM rollups WHERE 1=1', []
+        if start is not None:
+            sql, params = sql + ' AND day >= ?', params + [pd.Timestamp(start).strftime('%Y-%m-%d')]
+        if end is not None:
+            sql, params = sql + ' AND day <= ?', params + [pd.Timestamp(end).strftime('%Y-%m-%d')]
+        rows = pd.read_sql_query(sql, self.conn, params=params)
+        rows['day'] = pd.to_datetime(rows['day'])
+        return rows
+
+    def trends(self, by='Manager', weeks=12, end=None):
+        # Weekly scorecard: one row per (week, Manager or Tech) with visits,
+        # average Score, total duration and failures per criteria column.
+        end = pd.Timestamp(end if end is not None else pd.Timestamp.today()).normalize()
+        start = (end - pd.Timedelta(weeks=weeks - 1)).to_period('W').start_time
+        rows = self.query(start, end)
+        key = {'Manager': 'manager', 'Tech': 'tech'}[by]
+
+        rows['week'] = rows['day'].dt.to_period('W').dt.start_time
+        totals = rows.groupby(['week', key])[['visits', 'total_score', 'total_duration'] + criteria_columns].sum()
+        totals.insert(1, 'average_score', (totals['total_score'] / totals['visits']).round(2))
+        totals = totals.rename(columns={
+            'visits': 'Visits', 'average_score': 'Average Score',
+            'total_score': 'Total Score', 'total_duration': 'Total Duration',
+        })
+        return totals.rename_axis(['Week', by]).reset_index()
+
+    def close(self):
+        self.conn.close()
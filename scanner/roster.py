@@ -0,0 +1,149 @@
+import hashlib
+import io
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+# Tech -> manager assignment from a roster file (roster.csv; see its header
+# for the format). The file is parsed once per version: a changed
+# modification time or size reloads it. Managers are assigned to a whole
+# frame with one as-of join on Start Time, so a tech who moves teams keeps
+# the old manager on earlier visits.
+
+ROSTER_PATH = os.environ.get('SCANAPP_ROSTER', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roster.csv'))
+roster_columns = ['First Name', 'Last Name', 'Manager', 'Effective From']
+
+unassigned = 'Z - Other'
+
+DAY_FORMAT = '%m/%d/%Y'
+latest = pd.Timestamp.max.normalize()
+
+# In order of precedence.
+tech_columns = [('Tech 1 First Name', 'Tech 1 Last Name'), ('Tech 2 First Name', 'Tech 2 Last Name')]
+
+# entries: first, last, manager, since (sorted by since, then file order)
+# and key, which names maps (first, last) to. version fingerprints
+# the file contents for cache keys.
+Roster = namedtuple('Roster', ['entries', 'names', 'version'])
+
+class RosterError(ValueError):
+    pass
+
+# ---------- LOADING ----------
+
+def parse_roster(data, name='roster'):
+    df = pd.read_csv(io.BytesIO(data), comment='#', dtype=str, keep_default_na=False, skipinitialspace=True)
+    missing = [col for col in roster_columns if col not in df.columns]
+    if missing:
+        raise RosterError(f"Missing column(s) in {name}: {', '.join(missing)}")
+    since = df['Effective From'].str.strip()
+    dates = pd.to_datetime(since.where(since.ne('')), format='%Y-%m-%d', errors='coerce')
+    bad = since.ne('') & dates.isna()
+    if bad.any():
+        raise RosterError(f"Invalid Effective From in {name}: {', '.join(since[bad])} (expected YYYY-MM-DD)")
+    entries = pd.DataFrame({
+        'first': df['First Name'].str.strip(),
+        'last': df['Last Name'].str.strip(),
+        'manager': df['Manager'].str.strip(),
+        'since': dates.fillna(pd.Timestamp.min).astype('datetime64[ns]'),
+    })
+    entries = entries[entries['first'].ne('')].sort_values('since', kind='stable', ignore_index=True)
+    pairs = list(zip(entries['first'], entries['last']))
+    names = {pair: key for key, pair in enumerate(dict.fromkeys(pairs))}
+    entries['key'] = [names[pair] for pair in pairs]
+    return Roster(entries, names, hashlib.sha256(data).hexdigest()[:12])
+
+@lru_cache(maxsize=4)
+def _load(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        return parse_roster(f.read(), os.path.basename(path))
+
+def load_roster(path=None):
+    path = path or ROSTER_PATH
+    stat = os.stat(path)
+    return _load(path, stat.st_mtime_ns, stat.st_size)
+
+# ---------- ASSIGNMENT ----------
+
+def _names(df, col):
+    # (codes, names): the stripped text of each row as a code into names,
+    # with '' where the column or value is missing. Categoricals are
+    # stripped once per category.
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=np.int64), np.array([''], dtype=object)
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        names = np.append(s.cat.categories.astype(str).str.strip().to_numpy(dtype=object), '')
+        codes = s.cat.codes.to_numpy().astype(np.int64)
+        return np.where(codes < 0, len(names) - 1, codes), names
+    codes, names = pd.factorize(s.astype(object).where(s.notna(), '').astype(str).str.strip())
+    return codes, np.asarray(names, dtype=object)
+
+def _keys(first, last, names):
+    # Roster key of each (first, last) pair, -1 where the roster has none.
+    # Each distinct pair is looked up once.
+    (first_codes, firsts), (last_codes, lasts) = first, last
+    pairs, inverse = np.unique(first_codes * len(lasts) + last_codes, return_inverse=True)
+    found = np.array([names.get((firsts[p // len(lasts)], lasts[p % len(lasts)]), -1) for p in pairs], dtype=np.int64)
+    return found[inverse]
+
+def visit_day(value):
+    # Roster dates are whole days, so only the date part of Start Time
+    # matters. Visits without a readable date get the current roster.
+    day = pd.to_datetime(str(value)[:10], format=DAY_FORMAT, errors='coerce')
+    return latest if pd.isna(day) else day
+
+def visit_days(df):
+    # visit_day for a whole frame, parsing each distinct date once.
+    if 'Start Time' not in df.columns:
+        return np.full(len(df), latest.to_datetime64())
+    codes, dates = pd.factorize(df['Start Time'].astype(object).where(df['Start Time'].notna(), '').astype(str).str[:10])
+    days = pd.to_datetime(pd.Series(dates, dtype=object), format=DAY_FORMAT, errors='coerce').fillna(latest)
+    return days.to_numpy(dtype='datetime64[ns]')[codes]
+
+def assign_managers(df, roster=None):
+    # Each visit's techs, by full name and by first name only, are looked
+    # up in the roster's names; the candidates that exist are as-of joined
+    # against the entries at once, and each visit takes the manager of its
+    # highest-precedence candidate that matched.
+    roster = roster or load_roster()
+    rows = np.arange(len(df))
+    # Without dated entries every entry applies, whatever the visit's date.
+    dated = roster.entries['since'].gt(pd.Timestamp.min).any()
+    days = visit_days(df) if dated else np.full(len(df), latest.to_datetime64())
+    blank = np.zeros(len(df), dtype=np.int64), np.array([''], dtype=object)
+    candidates = []
+    for rank, (first_col, last_col) in enumerate(tech_columns):
+        first = _names(df, first_col)
+        for wildcard, last in enumerate([_names(df, last_col), blank]):
+            key = _keys(first, last, roster.names)
+            found = key >= 0
+            candidates.append(pd.DataFrame({
+                'row': rows[found], 'rank': 2 * rank + wildcard, 'day': days[found], 'key': key[found],
+            }))
+    candidates = pd.concat(candidates, ignore_index=True).sort_values('day', kind='stable')
+
+    matched = pd.merge_asof(
+        candidates, roster.entries[['since', 'key', 'manager']], left_on='day', right_on='since', by='key',
+        direction='backward'
+    ).dropna(subset=['manager'])
+    best = matched.sort_values(['row', 'rank'], kind='stable').drop_duplicates('row')
+
+    # Sorted categories, so sorting by Manager sorts by name.
+    managers = pd.Index(sorted(set(roster.entries['manager']) | {unassigned}))
+    codes = np.full(len(df), managers.get_loc(unassigned), dtype=np.int16)
+    codes[best['row'].to_numpy()] = managers.get_indexer(best['manager'])
+    return pd.Series(pd.Categorical.from_codes(codes, categories=managers), index=df.index)
+
+def manager_of(first, last, day, roster=None):
+    # One visit's manager, for the row-wise reference checks.
+    entries = (roster or load_roster()).entries
+    for wanted_last in (last, ''):
+        found = entries[entries['first'].eq(first) & entries['last'].eq(wanted_last) & entries['since'].le(day)]
+        if len(found):
+            return found['manager'].iloc[-1]
+    return None
@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .checks import criteria_columns
+from .keywords import (
+    any_hit, exclusion_phrases, followup_keywords, inventory_keywords, keyword_index,
+    phosphate_treatments, text_column as _text
+)
+from .roster import assign_managers, load_roster
+from .spelling import count_issues
+
+# Column-wise versions of the checks in scanner.checks. Every criteria column
+# is computed from whole-column masks in a single pass over the frame and
+# yields exactly the labels the row-wise functions return, held as
+# categoricals (int8 codes) rather than one string per visit.
+
+# Bump whenever a rule changes its output so cached results are invalidated.
+rules_version = 5
+
+def results_version():
+    # Results also depend on the roster the Manager column is assigned from.
+    return f'{rules_version}.{load_roster().version}'
+
+# ---------- COLUMN HELPERS ----------
+
+def _num(df, col):
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[col], errors='coerce')
+
+def _raw(df, col):
+    if col not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    return df[col]
+
+def _flag_true(df, col):
+    # Mirrors `value is True or str(value).strip().lower() == 'true' or value == 1`.
+    if col not in df.columns:
+        return pd.Series(False, index=df.index)
+    s = df[col]
+    is_true = _text(df, col).str.strip().str.lower().eq('true')
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+        return is_true | s.eq(1)
+    not_str = ~s.map(type).eq(str)
+    return is_true | (not_str & pd.to_numeric(s.where(not_str), errors='coerce').eq(1))
+
+def _has_notes(df):
+    return _text(df, 'Private Notes').str.strip().ne('') | _text(df, 'Customer Notes').str.strip().ne('')
+
+def _label(index, conditions, default):
+    # Categorical of the first matching label. Categories are sorted, so
+    # sorting by the codes sorts by label. Fixed labels are chosen as int8
+    # codes directly; per-row labels (a Series) are coded after the select.
+    masks = [c.to_numpy() for c, _ in conditions]
+    if any(isinstance(v, pd.Series) for _, v in conditions):
+        values = np.select(masks, [np.asarray(v, dtype=object) for _, v in conditions], default=default)
+        return pd.Series(pd.Categorical(values), index=index)
+    categories = sorted({v for _, v in conditions} | {default})
+    codes = np.select(masks, [categories.index(v) for _, v in conditions], default=categories.index(default))
+    return pd.Series(pd.Categorical.from_codes(codes.astype(np.int8), categories=categories), index=index)
+
+# ---------- CRITERIA ----------
+
+def manager(df):
+    return assign_managers(df)
+
+def chlorine_range(df, hits):
+    val = _num(df, 'Free Chlorine Reading')
+    return _label(df.index, [
+        (val.isna(), 'NA'),
+        (val < 3, 'Low Chlorine'),
+        (val > 8, 'High Chlorine'),
+    ], 'Pass')
+
+def cya_range(df, hits):
+    val = _num(df, 'Cyanuric Acid Reading')
+    return _label(df.index, [
+        (val.isna(), 'NA'),
+        ((val < 40) & hits['Items Used']['stabilizer'], 'Low and Adjusted'),
+        (val < 40, 'Fail'),
+        (val > 80, 'High CYA'),
+    ], 'Pass')
+
+def phosphate_range(df, hits):
+    val = _num(df, 'Phosphorus Reading')
+    treated = any_hit(hits, 'Items Used', phosphate_treatments)
+    return _label(df.index, [
+        (val.isna(), 'NA'),
+        (~treated & (val >= 600), 'Fail'),
+    ], 'Pass')
+
+def color_condition(df, hits):
+    cond = _raw(df, 'Water Condition Reading')
+    color = _raw(df, 'Water Color Reading')
+    missing = cond.isna() | color.isna()
+    bad_cond = cond.ne('Crystal Clear')
+    bad_color = color.ne('Blue')
+    cond_text = _text(df, 'Water Condition Reading')
+    color_text = _text(df, 'Water Color Reading')
+    return _label(df.index, [
+        (missing, 'NA'),
+        (bad_cond & bad_color, 'Fail - ' + cond_text + ', ' + color_text),
+        (bad_cond, 'Fail - ' + cond_text),
+        (bad_color, 'Fail - ' + color_text),
+    ], 'Pass')
+
+def filter_pressure(df, hits):
+    val = _num(df, 'Filter Pressure')
+    return _label(df.index, [
+        (val.isna(), 'NA'),
+        (val == 0, 'Fail'),
+        (val < 5, 'Low Pressure'),
+        (val > 22, 'High Pressure'),
+    ], 'Pass')
+
+def system_primed(df, hits):
+    value = _text(df, 'System Primed and Running').str.strip().str.lower()
+    return _label(df.index, [(value.eq('no'), 'Fail')], 'Pass')
+
+def followup(df, hits):
+    status = _raw(df, 'Service Status')
+    return _label(df.index, [
+        (status.eq('Complete'), 'Pass'),
+        (status.notna(), 'Fail'),
+    ], 'NA')
+
+def items_inventory(df, hits):
+    return _label(df.index, [
+        (hits['Items Used']['chem'], 'Pass'),
+        (any_hit(hits, 'Inventory Notes', inventory_keywords) & ~any_hit(hits, 'Items Used', inventory_keywords), 'Fail'),
+        (_has_notes(df), 'Pass'),
+    ], 'NA')
+
+def note_followup(df, hits):
+    return _label(df.index, [
+        (any_hit(hits, 'Notes', exclusion_phrases), 'Pass'),
+        (any_hit(hits, 'Notes', followup_keywords), 'Fail'),
+        (_has_notes(df), 'Pass'),
+    ], 'NA')
+
+def add_notes_next_visit(df, hits):
+    return _label(df.index, [(_flag_true(df, 'Add Notes for Next Visit'), 'Fail')], '')
+
+def quote_needed(df, hits):
+    return _label(df.index, [(_flag_true(df, 'Quote needed?'), 'Fail')], '')
+
+def chlorine_added(df, hits):
+    val = _num(df, 'Free Chlorine Reading')
+    return _label(df.index, [
+        (val.isna(), 'NA'),
+        ((val < 3) & ~hits['Items Used']['shock'], 'Fail'),
+    ], 'Pass')
+
+def water_sample(df, hits):
+    raw = _raw(df, 'Water Samples')
+    present = raw.notna() & _text(df, 'Water Samples').str.strip().ne('')
+    return _label(df.index, [(present, 'Sample to Test')], '')
+
+def spelling_rank(df, hits):
+    note = _text(df, 'Customer Notes').str.strip()
+    words, issues = count_issues(note)
+    rank = np.select([note.eq('').to_numpy(), (issues > 4) | (words < 3), issues > 1], [3, 1, 2], default=3)
+    return pd.Series(rank, index=df.index, dtype='int8')
+
+def marked_ready(df, inventory, followup_criteria):
+    billing = _text(df, 'Billing Status').str.strip().str.lower()
+    ready = billing.eq('ready')
+    return _label(df.index, [
+        (ready & (inventory.eq('Fail') | followup_criteria.eq('Fail')), 'Yes'),
+        (ready, 'Ready'),
+    ], '')
+
+# ---------- CODED RESULTS ----------
+
+# Criteria failures are kept per visit as a bitmask: bit i is set when
+# criteria_columns[i] is 'Fail'. Score is its popcount, and Action Items
+# are coded by failure set, so each distinct set is spelled out only once.
+
+_popcount = np.array([bin(m).count('1') for m in range(1 << len(criteria_columns))], dtype=np.int8)
+
+def failure_mask(results):
+    mask = np.zeros(len(results), dtype=np.uint16)
+    for bit, col in enumerate(criteria_columns):
+        mask |= results[col].eq('Fail').to_numpy().astype(np.uint16) << np.uint16(bit)
+    return mask
+
+def describe(failures, sample):
+    # The Action Items text for one failure set.
+    items = [f'{col}: Fail' for bit, col in enumerate(criteria_columns) if failures >> bit & 1]
+    if sample:
+        items.append('Water Sample: Sample to Test')
+    return ', '.join(items)
+
+def action_items(results, failures):
+    codes = failures.astype(np.int32) << 1 | results['Water Sample'].eq('Sample to Test').to_numpy()
+    present = np.flatnonzero(np.bincount(codes, minlength=2 << len(criteria_columns)))
+    lookup = np.zeros(2 << len(criteria_columns), dtype=np.int16)
+    lookup[present] = np.arange(len(present))
+    categories = [describe(code >> 1, code & 1) for code in present]
+    return pd.Series(pd.Categorical.from_codes(lookup[codes], categories=categories), index=results.index)
+
+def score(failures):
+    return _popcount[failures]
+
+# Result columns and their compact dtypes. Rows read back from a
+# ResultStore, or concatenated from chunks with different categories, come
+# back as plain values and are re-coded with compact().
+coded_columns = {
+    'Manager': 'category', 'Score': 'int8', 'Spelling Rank (1-3)': 'int8',
+    'Marked Ready': 'category', 'Action Items': 'category',
+    **{col: 'category' for col in criteria_columns},
+    'Add Notes for Next Visit': 'category', 'Quote needed?': 'category', 'Water Sample': 'category',
+}
+
+def compact(df):
+    for col, dtype in coded_columns.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+# ---------- ENGINE ----------
+
+column_rules = [
+    ('Chlorine Range', chlorine_range),
+    ('CYA Range', cya_range),
+    ('Phosphate Range Untreated', phosphate_range),
+    ('Color And Condition', color_condition),
+    ('Filter Pressure', filter_pressure),
+    ('System Primed', system_primed),
+    ('Followup', followup),
+    ('Items added to inventory?', items_inventory),
+    ('Note Followup Criteria', note_followup),
+    ('Add Notes for Next Visit', add_notes_next_visit),
+    ('Quote needed?', quote_needed),
+    ('Chlorine Added', chlorine_added),
+    ('Water Sample', water_sample),
+    ('Spelling Rank (1-3)', spelling_rank),
+]
+
+def evaluate(df_filtered):
+    rows = len(df_filtered)
+    df_filtered = df_filtered.copy()
+    with profiling.stage('Manager', rows):
+        df_filtered['Manager'] = manager(df_filtered)
+        df_filtered['Manager - Tech - Duration'] = df_filtered['Manager'].astype(object) + ' - ' + df_filtered['Tech 1 First Name'].astype(object) + ' - ' + df_filtered['Duration'].astype(str).astype(object)
+
+    with profiling.stage('keyword index', rows):
+        hits = keyword_index(df_filtered)
+    results = pd.DataFrame(index=df_filtered.index)
+    for col, rule in column_rules:
+        with profiling.stage(col, rows):
+            results[col] = rule(df_filtered, hits)
+    with profiling.stage('Marked Ready', rows):
+        results['Marked Ready'] = marked_ready(df_filtered, results['Items added to inventory?'], results['Note Followup Criteria'])
+    with profiling.stage('Action Items and Score', rows):
+        failures = failure_mask(results)
+        results['Action Items'] = action_items(results, failures)
+        results['Score'] = score(failures)
+
+    for col in results.columns:
+        df_filtered[col] = results[col]
+    return df_filtered
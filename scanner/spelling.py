@@ -0,0 +1,127 @@
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Dictionary-backed spelling check for Customer Notes. Words are looked up in
+# an in-memory lexicon (lexicon/*.txt: a ~47k-word general English list plus
+# pool chemicals, equipment and brands) after undoing regular inflections,
+# so inflected forms missing from the lists are still known. Tech notes
+# reuse a small vocabulary, so every distinct token is classified once and
+# the verdict is memoized; a column of notes is scored in one pass over its
+# distinct tokens.
+
+LEXICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lexicon')
+lexicon_files = ['english.txt', 'pool.txt']
+
+# Characters the original check allowed in a word; anything else is still
+# counted as an issue.
+_odd_character = re.compile(r'[^a-zA-Z0-9.,?!\'"()\-]')
+_edge_punctuation = '.,?!\'"()-:;'
+_sentence_end = ('.', '!', '?')
+_contractions = ("n't", "'ll", "'re", "'ve", "'s", "'d", "'m")
+_prefixes = ('re', 'un', 'pre')
+
+# (suffix, endings to put back): tested -> test, removed -> remove, ...
+_suffixes = [
+    ('iest', ['y']), ('ier', ['y']), ('ies', ['y']), ('ied', ['y']), ('ily', ['y']),
+    ('ing', ['', 'e']), ('est', ['', 'e']), ('ed', ['', 'e']), ('er', ['', 'e']),
+    ('es', ['']), ('s', ['']), ('ly', ['']), ('ment', ['']), ('ness', ['']), ('able', ['', 'e']),
+]
+
+KNOWN, UNKNOWN, NAME = 0, 1, 2
+
+@lru_cache(maxsize=None)
+def lexicon():
+    words = set()
+    for name in lexicon_files:
+        with open(os.path.join(LEXICON_DIR, name), encoding='utf-8') as f:
+            for line in f:
+                words.update(line.split('#', 1)[0].lower().split())
+    return frozenset(words)
+
+def _stems(word):
+    for suffix, endings in _suffixes:
+        if word.endswith(suffix) and len(word) > len(suffix) + 1:
+            base = word[:-len(suffix)]
+            for ending in endings:
+                yield base + ending
+            # Doubled final consonant: stopped -> stop, cleaner stays cleaner.
+            if len(base) > 2 and base[-1] == base[-2]:
+                yield base[:-1]
+
+def is_word(word, depth=2):
+    words = lexicon()
+    if word in words:
+        return True
+    for contraction in _contractions:
+        if word.endswith(contraction) and len(word) > len(contraction):
+            return is_word(word[:-len(contraction)], depth)
+    if depth == 0:
+        return False
+    if any(is_word(stem, depth - 1) for stem in _stems(word)):
+        return True
+    return any(word.startswith(prefix) and is_word(word[len(prefix):], depth - 1) for prefix in _prefixes)
+
+@lru_cache(maxsize=1 << 16)
+def classify(token):
+    # KNOWN, UNKNOWN, or NAME: not in the lexicon but capitalized, which is
+    # only an issue at the start of a sentence (otherwise it reads as a
+    # customer, tech or product name).
+    # Numbers, readings, times and measurements are never misspelled.
+    if any(c.isdigit() for c in token):
+        return KNOWN
+    word = token.replace('’', "'").strip(_edge_punctuation)
+    if _odd_character.search(word):
+        return UNKNOWN
+    if not word:
+        return KNOWN
+    lower = word.lower()
+    if is_word(lower) or all(is_word(part) for part in lower.split('-') if part):
+        return KNOWN
+    return NAME if word[0].isupper() else UNKNOWN
+
+def is_issue(token, sentence_start):
+    verdict = classify(token)
+    return verdict == UNKNOWN or (verdict == NAME and sentence_start)
+
+def _tokenize(notes):
+    # (note position, token code) per whitespace-separated token, in note
+    # order, plus the distinct tokens the codes refer to. pyarrow splits
+    # and dictionary-encodes several times faster when it is installed.
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        tokens = pd.Series(notes.to_numpy(), index=pd.RangeIndex(len(notes))).str.split().explode().dropna()
+        codes, distinct = pd.factorize(tokens)
+        return tokens.index.to_numpy(), codes, list(distinct)
+    lists = pc.utf8_split_whitespace(pa.array(notes.to_numpy(dtype=object), type=pa.string()))
+    tokens, rows = pc.list_flatten(lists), pc.list_parent_indices(lists)
+    # Unlike str.split(), arrow keeps empty tokens at the ends of a string.
+    kept = pc.not_equal(tokens, '')
+    encoded = tokens.filter(kept).dictionary_encode()
+    return rows.filter(kept).to_numpy(), encoded.indices.to_numpy(), encoded.dictionary.to_pylist()
+
+def count_issues(notes):
+    # Words and misspelled words per note, as int64 arrays aligned with
+    # `notes` (a Series of str). Tokens are whitespace separated, as before.
+    rows, codes, distinct = _tokenize(notes)
+    words = np.bincount(rows, minlength=len(notes))
+    if not len(rows):
+        return words, np.zeros(len(notes), dtype='int64')
+
+    verdicts = np.fromiter(map(classify, distinct), dtype=np.int8, count=len(distinct))[codes]
+    issues = verdicts == UNKNOWN
+
+    # Capitalized unknown words count only when they open a sentence.
+    names = np.flatnonzero(verdicts == NAME)
+    if len(names):
+        first = np.r_[True, rows[1:] != rows[:-1]][names]
+        after_stop = np.fromiter(
+            (distinct[codes[i - 1]].endswith(_sentence_end) for i in names), dtype=bool, count=len(names)
+        )
+        issues[names] = first | after_stop
+    return words, np.bincount(rows, weights=issues, minlength=len(notes)).astype('int64')
@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# Cold-start timing. scanapp.py wraps each import and startup stage in
+# timed(); the first script run logs the report once per process. Running
+#
+#     python -m scanner.startup [scanapp.py]
+#
+# executes the app in a fresh interpreter (Streamlit bare mode, no upload)
+# and fails if the total exceeds SCANAPP_STARTUP_BUDGET seconds or an export
+# backend was imported at startup.
+
+log = logging.getLogger(__name__)
+
+budget_seconds = float(os.environ.get('SCANAPP_STARTUP_BUDGET', '5'))
+
+# Only needed once someone downloads or previews an export.
+export_modules = ['matplotlib', 'xlsxwriter', 'seaborn']
+
+_process_start = time.perf_counter()
+timings = {}
+_reported = False
+
+@contextmanager
+def timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Streamlit re-executes the script on every rerun; keep the cold
+        # (first) measurement only.
+        timings.setdefault(name, time.perf_counter() - start)
+
+def report():
+    return {
+        'stages': {name: round(seconds, 4) for name, seconds in timings.items()},
+        'total': round(time.perf_counter() - _process_start, 4),
+        'budget': budget_seconds,
+        'export_modules_loaded': [m for m in export_modules if m in sys.modules],
+    }
+
+def log_report():
+    global _reported
+    if _reported:
+        return
+    _reported = True
+    result = report()
+    level = logging.WARNING if result['total'] > budget_seconds else logging.INFO
+    log.log(level, 'startup %s', json.dumps(result))
+
+# ---------- BUDGET CHECK ----------
+
+_probe = """
+import json, runpy, sys, time
+start = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name='__main__')
+from scanner import startup
+result = startup.report()
+result['total'] = round(time.perf_counter() - start, 4)
+print(json.dumps(result))
+"""
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    script = os.path.abspath(argv[0] if argv else 'scanapp.py')
+    proc = subprocess.run(
+        [sys.executable, '-c', _probe, script],
+        cwd=os.path.dirname(script), capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        return proc.returncode
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    print(json.dumps(result, indent=2))
+
+    failures = []
+    if result['total'] > budget_seconds:
+        failures.append(f"startup took {result['total']:.2f}s, budget is {budget_seconds:.2f}s")
+    if result['export_modules_loaded']:
+        failures.append(f"export backends imported at startup: {', '.join(result['export_modules_loaded'])}")
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
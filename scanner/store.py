@@ -0,0 +1,76 @@
+import sqlite3
+
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+# Persistent per-visit result store. Daily exports overlap heavily, so each
+# evaluated visit is saved under a stable identity hash together with a hash
+# of every input field the checks read. On the next upload only visits that
+# are new, or whose inputs changed, are evaluated again.
+
+identity_columns = ['Customer Name', 'Tech 1 First Name', 'Start Time', 'Service Type']
+
+# ---------- HASHING ----------
+
+def _hash(df, columns):
+    frame = pd.DataFrame({col: df[col] if col in df.columns else None for col in columns}, index=df.index)
+    # SQLite integers are signed 64-bit.
+    return hash_pandas_object(frame, index=False).astype('int64')
+
+def visit_keys(df):
+    return _hash(df, identity_columns)
+
+def input_hashes(df, input_columns):
+    return _hash(df, [col for col in input_columns if col in df.columns])
+
+# ---------- STORE ----------
+
+class ResultStore:
+    def __init__(self, path, columns, version):
+        self.path = path
+        self.columns = list(columns)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self._ensure_schema(version)
+
+    def _ensure_schema(self, version):
+        # Results from another rule version (or report layout) are all stale,
+        # so the table is rebuilt rather than migrated.
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'layout'").fetchone()
+        layout = f'{version}:' + '|'.join(self.columns)
+        if row is None or row[0] != layout:
+            quoted = ', '.join(f'"{col}"' for col in self.columns)
+            with self.conn:
+                self.conn.execute('DROP TABLE IF EXISTS visits')
+                self.conn.execute(
+                    f'CREATE TABLE visits (visit_key INTEGER PRIMARY KEY, input_hash INTEGER NOT NULL, {quoted})'
+                )
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('layout', ?)", (layout,))
+
+    def lookup(self, keys):
+        # Matching rows indexed by visit_key. Keys go through a temp table
+        # so large exports don't hit SQLite's bound-parameter limit.
+        with self.conn:
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS wanted (visit_key INTEGER PRIMARY KEY)')
+            self.conn.execute('DELETE FROM wanted')
+            self.conn.executemany('INSERT OR IGNORE INTO wanted VALUES (?)', ((int(k),) for k in keys))
+        found = pd.read_sql_query('SELECT visits.* FROM visits JOIN wanted USING (visit_key)', self.conn)
+        # Not set_index: pandas tries to turn two-row int64 keys into a
+        # RangeIndex and overflows on hash-sized values.
+        found.index = pd.Index(found.pop('visit_key').to_numpy(), name='visit_key')
+        return found
+
+    def save(self, keys, hashes, results):
+        results = results[self.columns].astype(object)
+        results = results.where(results.notna(), None)
+        rows = (
+            (int(key), int(h), *values)
+            for key, h, values in zip(keys, hashes, results.itertuples(index=False, name=None))
+        )
+        placeholders = ', '.join('?' * (len(self.columns) + 2))
+        with self.conn:
+            self.conn.executemany(f'INSERT OR REPLACE INTO visits VALUES ({placeholders})', rows)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from scanner import analyze, read_services
+from scanner.browse import ResultIndex
+from scanner.checks import criteria_columns
+
+# ResultIndex filters must select exactly the rows filtering the report
+# itself would.
+
+@pytest.fixture(scope='module')
+def analysis():
+    return analyze(read_services('services.csv'))
+
+@pytest.fixture(scope='module')
+def index(analysis):
+    return ResultIndex(analysis.output, analysis.tech)
+
+def test_failure_options_are_criteria_columns(index):
+    assert index.failure_columns == criteria_columns
+
+@pytest.mark.parametrize('failing', [
+    ['Note Followup Criteria'], ['Filter Pressure', 'Followup'], ['Chlorine Added', 'CYA Range', 'Chlorine Range'],
+])
+def test_select_failing(analysis, index, failing):
+    df = analysis.output
+    expected = np.flatnonzero(df[failing].eq('Fail').any(axis=1).to_numpy())
+    assert len(expected)
+    assert index.select(failing=failing).tolist() == expected.tolist()
+
+def test_select_combined(analysis, index):
+    df = analysis.output
+    failing = ['Filter Pressure', 'Note Followup Criteria']
+    expected = np.flatnonzero((
+        df['Manager'].isin(['Alex', 'Quentin']) & df['Score'].ge(2) & df[failing].eq('Fail').any(axis=1)
+    ).to_numpy())
+    assert len(expected)
+    positions = index.select({'Manager': ['Alex', 'Quentin']}, min_score=2, failing=failing)
+    assert positions.tolist() == expected.tolist()
+    assert index.page(positions, 0, 5).equals(df.iloc[expected[:5]])
+
+def test_select_unfiltered(index):
+    assert index.select().tolist() == list(range(index.size))
@@ -0,0 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from scanner import analyze, read_services
+from scanner.export import paginate, table_image
+
+def test_table_images_render_concurrently():
+    # Download buttons render pages on Streamlit's callback threads, so
+    # pages drawn at the same time must not draw into each other.
+    pages = [page for _, page in paginate(analyze(read_services('services.csv')).output, 8)]
+    expected = [table_image(page) for page in pages]
+    with ThreadPoolExecutor(len(pages)) as pool:
+        assert list(pool.map(table_image, pages)) == expected
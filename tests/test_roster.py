@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scanner import roster
+from scanner.checks import assign_manager
+from scanner.roster import assign_managers, parse_roster
+
+# A dated roster: Alex moves from Quentin's team to Bea's on 05/10, Sam K
+# has a full-name row that outranks the first-name-only Sam row, and Nate
+# is only on the roster from 05/05.
+ROSTER = b"""First Name,Last Name,Manager,Effective From
+Alex,E,Quentin,
+Alex,E,Bea,2025-05-10
+Sam,,Wild,
+Sam,K,Jo,
+Nate,D,Quentin,2025-05-05
+"""
+
+# (Tech 1, Tech 2, Start Time, expected manager)
+visits = [
+    (('Alex', 'E'), (None, None), '05/09/2025 11:59 pm', 'Quentin'),
+    (('Alex', 'E'), (None, None), '05/10/2025 12:00 am', 'Bea'),
+    ((' Alex ', ' E '), (None, None), '06/01/2025 09:00 am', 'Bea'),
+    (('Sam', 'K'), (None, None), '05/01/2025 09:00 am', 'Jo'),
+    (('Sam', 'Q'), (None, None), '05/01/2025 09:00 am', 'Wild'),
+    (('Sam', None), (None, None), '05/01/2025 09:00 am', 'Wild'),
+    (('Bob', 'Y'), ('Sam', 'K'), '05/01/2025 09:00 am', 'Jo'),
+    (('Nate', 'D'), ('Alex', 'E'), '05/04/2025 09:00 am', 'Quentin'),
+    (('Nate', 'D'), ('Sam', 'Q'), '05/04/2025 09:00 am', 'Wild'),
+    (('Nate', 'D'), ('Sam', 'Q'), '05/05/2025 07:00 am', 'Quentin'),
+    (('Bob', 'Y'), (None, None), '05/01/2025 09:00 am', 'Z - Other'),
+    ((None, None), (None, None), '05/01/2025 09:00 am', 'Z - Other'),
+    # Without a readable Start Time the latest rows apply.
+    (('Alex', 'E'), (None, None), None, 'Bea'),
+    (('Nate', 'D'), ('Sam', 'K'), None, 'Quentin'),
+    (('Alex', 'E'), (None, None), 'not a date', 'Bea'),
+]
+
+@pytest.fixture
+def visits_frame():
+    return pd.DataFrame({
+        'Tech 1 First Name': [tech1[0] for tech1, _, _, _ in visits],
+        'Tech 1 Last Name': [tech1[1] for tech1, _, _, _ in visits],
+        'Tech 2 First Name': [tech2[0] for _, tech2, _, _ in visits],
+        'Tech 2 Last Name': [tech2[1] for _, tech2, _, _ in visits],
+        'Start Time': [start for _, _, start, _ in visits],
+    }).fillna(np.nan)
+
+@pytest.fixture
+def dated_roster(tmp_path, monkeypatch):
+    path = tmp_path / 'roster.csv'
+    path.write_bytes(ROSTER)
+    # The row-wise reference loads the roster from ROSTER_PATH.
+    monkeypatch.setattr(roster, 'ROSTER_PATH', str(path))
+    return parse_roster(ROSTER)
+
+def test_dated_assignment(visits_frame, dated_roster):
+    expected = [manager for _, _, _, manager in visits]
+    assert assign_managers(visits_frame, dated_roster).astype(object).tolist() == expected
+
+def test_matches_rowwise(visits_frame, dated_roster):
+    assert assign_managers(visits_frame).astype(object).tolist() == visits_frame.apply(assign_manager, axis=1).tolist()
+
+def test_categorical_names(visits_frame, dated_roster):
+    names = [col for col in visits_frame.columns if col != 'Start Time']
+    typed = visits_frame.astype({col: 'category' for col in names})
+    assert assign_managers(typed, dated_roster).astype(object).tolist() == [manager for _, _, _, manager in visits]
+
+def test_invalid_date():
+    with pytest.raises(roster.RosterError, match='2025-13-01'):
+        parse_roster(b'First Name,Last Name,Manager,Effective From\nAlex,E,Bea,2025-13-01\n')
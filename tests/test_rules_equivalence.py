@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate, write_csv
+from scanner.checks import apply_rowwise
+from scanner.ingest import read_services
+from scanner.pipeline import filter_services
+from scanner.rules import evaluate
+
+# The rule engine must give exactly the labels of the row-wise reference
+# checks in scanner.checks, whatever the input's dtypes.
+
+SERVICES_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'services.csv')
+
+def _labels(s):
+    return s.astype(object).where(s.notna(), '<NA>').astype(str).tolist()
+
+def assert_same(df):
+    expected, actual = apply_rowwise(df), evaluate(df)
+    assert set(actual.columns) == set(expected.columns)
+    for col in expected.columns:
+        assert _labels(actual[col]) == _labels(expected[col]), col
+
+def _edge_cases(n, seed=1):
+    # Values the typed reader never produces: stray whitespace and case,
+    # boolean-ish strings, unicode and empty notes.
+    rng = np.random.default_rng(seed)
+    words = [
+        'install', 'leave', 'using', 'sell', 'complete', 'follow up', 'schedule', 'quote', 'return', 'next visit',
+        'need to come back', 'have a good', 'see you next year', 'closed for the season', 'hello', 'pool', 'café',
+        '#3', 'x', '', '  ',
+    ]
+    items = ['stabilizer', 'shock', 'phosfree', 'pool perfect', 'phosphate', 'chem', 'install', 'chlorine', '']
+
+    def pick(values):
+        return [values[i] for i in rng.integers(len(values), size=n)]
+
+    def text(pool, k):
+        return [np.nan if rng.random() < 0.5 else ' '.join(pick(pool)[:rng.integers(k + 1)]) for _ in range(n)]
+
+    return pd.DataFrame({
+        'Service Type': ['Service Call'] * n,
+        'Tech 1 First Name': pick(['Nate', 'David', 'Alex', 'Avery', 'Bob', ' Noah ']),
+        'Duration': rng.integers(100, size=n),
+        'Free Chlorine Reading': pick([np.nan, 0, 2.9, 3, 5, 8, 8.1]),
+        'Cyanuric Acid Reading': pick([np.nan, 0, 39, 40, 80, 81]),
+        'Phosphorus Reading': pick([np.nan, 0, 599, 600, 1000]),
+        'Water Condition Reading': pick([np.nan, 'Crystal Clear', 'Cloudy']),
+        'Water Color Reading': pick([np.nan, 'Blue', 'Green']),
+        'Filter Pressure': pick([np.nan, 0, 4, 5, 22, 23]),
+        'System Primed and Running': pick([np.nan, 'No', ' no ', 'Yes']),
+        'Service Status': pick([np.nan, 'Complete', 'Skipped']),
+        'Private Notes': text(words, 6),
+        'Customer Notes': text(words, 6),
+        'Items Used': text(items, 3),
+        'Add Notes for Next Visit': pick([np.nan, True, False, 'true', ' TRUE ', '1', 'no']),
+        'Quote needed?': pick([np.nan, 1.0, 0.0]),
+        'Water Samples': pick([np.nan, '', ' ', 'yes']),
+        'Billing Status': pick([np.nan, 'Ready', 'Not Billed', ' ready ', 'Unbillable']),
+    })
+
+def test_services_csv_typed():
+    assert_same(filter_services(read_services(SERVICES_CSV)))
+
+def test_services_csv_raw_read_csv():
+    assert_same(filter_services(pd.read_csv(SERVICES_CSV)))
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_synthetic(seed):
+    assert_same(filter_services(generate(2000, seed)))
+
+def test_synthetic_typed(tmp_path):
+    path = tmp_path / 'services.csv'
+    write_csv(path, 2000, seed=3)
+    assert_same(filter_services(read_services(path)))
+
+def test_edge_cases():
+    assert_same(_edge_cases(3000))
+
+def test_missing_columns():
+    assert_same(_edge_cases(500)[['Service Type', 'Tech 1 First Name', 'Duration']])
+
+def test_empty():
+    assert_same(filter_services(read_services(SERVICES_CSV)).iloc[:0])
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from scanner.rules import spelling_rank
+from scanner.spelling import KNOWN, NAME, UNKNOWN, classify
+
+# Notes that do not appear in services.csv, so the lexicon is exercised
+# beyond the sample export.
+
+@pytest.mark.parametrize('token', [
+    'grinding', 'lubricated', 'sparkling,', 'diving', 'Replaced', 'gasket.', "didn't", 'neighbor', 'thoroughly',
+    'backwashed', 'skimmer', 'muriatic', 'pH', '3.5ppm', '(approx.)', 'well-being',
+])
+def test_known_words(token):
+    assert classify(token) == KNOWN
+
+@pytest.mark.parametrize('token', ['teh', 'recieve', 'definately', 'seperate', 'becuase', 'wierd', 'pumpp', 'filtr'])
+def test_misspellings(token):
+    assert classify(token) == UNKNOWN
+
+def test_capitalized_unknown_is_a_name():
+    assert classify('Zyxwell') == NAME
+
+def _ranks(notes):
+    return spelling_rank(pd.DataFrame({'Customer Notes': notes}), None).tolist()
+
+def test_ordinary_notes_rank_3():
+    assert _ranks([
+        'Pump motor was grinding, so I lubricated the bearings and it runs quietly now.',
+        'The water is sparkling and ready for diving this weekend.',
+        "Brushed the walls, emptied the baskets and vacuumed the deep end. Everything looks great!",
+        'Heater would not ignite; the pilot assembly needs replacing. I ordered the part.',
+    ]) == [3, 3, 3, 3]
+
+def test_misspelled_notes_rank_lower():
+    assert _ranks([
+        'Teh pump was makeing a wierd noise.',
+        'Recieve teh part nxt weak, definately wierd seperate filtr.',
+        'ok',
+    ]) == [2, 1, 1]
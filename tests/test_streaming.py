@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_csv
+from scanner import MissingColumnsError, analyze, analyze_stream, read_exports, read_services
+from scanner.pipeline import open_store
+from scanner.store import visit_keys
+
+# Streaming mode folds chunk partials together; it must give exactly what
+# analyzing the whole export at once gives.
+
+@pytest.fixture(scope='module')
+def export(tmp_path_factory):
+    path = tmp_path_factory.mktemp('exports') / 'services.csv'
+    write_csv(path, 2000)
+    return path, analyze(read_services(path))
+
+@pytest.mark.parametrize('chunksize', [300, 2000])
+def test_summaries_match(export, chunksize):
+    path, batch = export
+    stream = analyze_stream(path, chunksize)
+    assert list(stream.summaries) == list(batch.summaries)
+    for name, summary in batch.summaries.items():
+        pd.testing.assert_frame_equal(stream.summaries[name], summary, check_dtype=False)
+
+@pytest.mark.parametrize('chunksize', [300, 2000])
+def test_output_matches(export, chunksize):
+    path, batch = export
+    stream = analyze_stream(path, chunksize)
+    pd.testing.assert_frame_equal(
+        stream.output.reset_index(drop=True).astype(object),
+        batch.output.reset_index(drop=True).astype(object),
+    )
+
+def test_store_reused_across_modes(export, tmp_path):
+    # Stored results do not depend on how the export was read.
+    path, batch = export
+    store = open_store(str(tmp_path / 'results.sqlite'))
+    try:
+        first = analyze(read_services(path), store)
+        streamed = analyze_stream(path, 300, store)
+        again = analyze(read_services(path), store)
+    finally:
+        store.close()
+    assert first.stats['reused'] == 0
+    assert streamed.stats == again.stats == {'evaluated': 0, 'reused': first.stats['evaluated']}
+    pd.testing.assert_frame_equal(
+        streamed.output.reset_index(drop=True).astype(object), batch.output.reset_index(drop=True).astype(object)
+    )
+
+def test_multiple_exports_match(export):
+    path, _ = export
+    data = open(path, 'rb').read()
+    half = pd.read_csv(path, nrows=900).to_csv(index=False).encode()
+    exports = [('a.csv', half), ('b.csv', data)]
+    batch, stream = analyze(read_exports(exports)), analyze_stream(exports, 300)
+    pd.testing.assert_frame_equal(
+        stream.output.reset_index(drop=True).astype(object), batch.output.reset_index(drop=True).astype(object)
+    )
+
+def test_bad_export_named_before_streaming(tmp_path):
+    good = open('services.csv', 'rb').read()
+    bad = pd.read_csv('services.csv').drop(columns=['Duration']).to_csv(index=False).encode()
+    store = open_store(str(tmp_path / 'results.sqlite'))
+    try:
+        with pytest.raises(MissingColumnsError, match='in bad.csv: Duration'):
+            analyze_stream([('good.csv', good), ('bad.csv', bad)], 20, store)
+        # Nothing from good.csv was checked before the bad header was found.
+        assert store.lookup(visit_keys(read_services('services.csv'))).empty
+    finally:
+        store.close()